@@ -1,25 +1,32 @@
 import pygame
-from utils import PerlinNoiseOverlay
+from utils import AssetManager
+from noise_overlay import PerlinNoiseOverlay
+from frame_stream import FrameStream
+from transitions import FadeOverlay
+from formats import PREMULTIPLIED
+import display
 import math
 import sys
+from collections import OrderedDict
 
 class Animation:
-    def __init__(self, width=1280, height=720):
+    def __init__(self, width=1280, height=720, asset_manager=None):
         pygame.init()
         
         # Initialize display
         self.width = width
         self.height = height
-        self.screen = pygame.display.set_mode((width, height))
+        self.screen = display.get_target()
+        self.asset_manager = asset_manager or AssetManager()
         
         # Create noise overlay
-        self.noise_overlay = PerlinNoiseOverlay(width, height, 200, 150, scale=0.5, alpha=20)
+        self.noise_overlay = PerlinNoiseOverlay(*self.screen.get_size(), 200, 150, scale=0.5, alpha=20)
         
-        # Load background image
-        self.bg = pygame.image.load("assets/images/intro1/intro1_bg.png")
+        # Load background image, scaled to the internal resolution at load time
+        self.bg = self._load_render_image("assets/images/intro1/intro1_bg.png")
         
-        # Load intro frames
-        self.frames = [pygame.image.load(f"assets/images/intro1/intro{i}.png") for i in range(1, 13)]
+        # Stream intro frames, decoding only a few ahead of playback
+        self.frames = FrameStream([f"assets/images/intro1/intro{i}.png" for i in range(1, 13)])
         
         # Set custom frame durations (in milliseconds)
         self.frame_durations = [500, 500, 100, 200, 100, 100, 100, 200, 200, 200, 200, 800]
@@ -29,6 +36,10 @@ class Animation:
         self.frame_index = 0
         self.time_accumulator = 0
         self.completed = False
+
+    def _load_render_image(self, path):
+        """Load a full-screen image at the internal render resolution."""
+        return self.asset_manager.render_image(self.asset_manager.load_image(path))
     
     def update(self):
         """Update animation state for one frame"""
@@ -40,14 +51,16 @@ class Animation:
         dt = self.clock.tick(60)
         self.time_accumulator += dt
         
-        # Advance frame if the duration has elapsed
-        if self.time_accumulator >= self.frame_durations[self.frame_index]:
-            self.time_accumulator = 0
+        # Advance frames whose duration has elapsed, carrying the remainder
+        # so frame timing does not drift
+        while self.time_accumulator >= self.frame_durations[self.frame_index]:
+            self.time_accumulator -= self.frame_durations[self.frame_index]
             self.frame_index += 1
             
             # Check if animation is complete
             if self.frame_index >= len(self.frames):
                 self.completed = True
+                self.frames.close()
                 return True
         
         return False
@@ -59,15 +72,12 @@ class Animation:
         
         # Draw current frame if animation is not complete
         if not self.completed and self.frame_index < len(self.frames):
-            self.screen.blit(self.frames[self.frame_index], (0, 0))
+            frame, offset = self.frames.get(self.frame_index)
+            self.screen.blit(frame, offset, None, PREMULTIPLIED)
         
         # Apply noise overlay
-        noise_surface = self.noise_overlay.generate()
-        self.screen.blit(noise_surface, (0, 0))
+        self.noise_overlay.draw(self.screen)
         self.noise_overlay.update()
-        
-        # Update display
-        pygame.display.flip()
     
     def handle_events(self):
         """Handle pygame events, return False to quit"""
@@ -85,11 +95,68 @@ class Animation:
         self.frame_index = 0
         self.time_accumulator = 0
         self.completed = False
+        self.frames.reset()
+
+
+
+class ScaleLadder:
+    """
+    Cache of animation frames pre-scaled to quantized square sizes.
+
+    Sizes are rounded to a multiple of `step` pixels and each (frame, size)
+    pair is scaled once, the first time it is drawn. The cache is bounded by
+    `max_bytes` and evicts the least recently used sizes, which suits the
+    monotonic growth or shrink of CurveAnimation.
+    """
+    def __init__(self, frames, step=4, max_bytes=16 * 1024 * 1024):
+        """
+        Args:
+            frames (list): Source frames at full size
+            step (int): Size quantization in pixels
+            max_bytes (int): Upper bound on cached pixel data
+        """
+        self.frames = frames
+        self.step = step
+        self.max_bytes = max_bytes
+        self.cache = OrderedDict()
+        self.cached_bytes = 0
+
+    def quantize(self, size):
+        """Round a size to the ladder step."""
+        return max(self.step, int(round(size / self.step)) * self.step)
+
+    def get(self, frame_index, size):
+        """
+        Return a frame scaled to the quantized size.
+
+        Args:
+            frame_index (int): Index into the source frames
+            size (float): Desired width and height in pixels
+
+        Returns:
+            pygame.Surface: Cached scaled frame
+        """
+        key = (frame_index, self.quantize(size))
+        image = self.cache.get(key)
+        if image is not None:
+            self.cache.move_to_end(key)
+            return image
 
+        image = pygame.transform.scale(self.frames[frame_index], (key[1], key[1]))
+        self.cache[key] = image
+        self.cached_bytes += key[1] * key[1] * image.get_bytesize()
+        while self.cached_bytes > self.max_bytes and len(self.cache) > 1:
+            (_, old_size), old_image = self.cache.popitem(last=False)
+            self.cached_bytes -= old_size * old_size * old_image.get_bytesize()
+        return image
+
+    def clear(self):
+        self.cache.clear()
+        self.cached_bytes = 0
 
 
 class CurveAnimation:
-    def __init__(self, start_size=200, end_size=20, k=0.005, back=0, width=1280, height=720, fps=60):
+    def __init__(self, start_size=200, end_size=20, k=0.005, back=0, width=1280, height=720, fps=60, asset_manager=None):
         # Initialize display parameters
         self.WIDTH = width
         self.HEIGHT = height
@@ -120,27 +187,37 @@ class CurveAnimation:
         
         # Load assets
         pygame.init()
-        self.screen = pygame.display.set_mode((self.WIDTH, self.HEIGHT))
+        self.screen = display.get_target()
         self.clock = pygame.time.Clock()
+        self.asset_manager = asset_manager or AssetManager()
         
         # Load images
         if back == 0:
-            self.player_images = [pygame.image.load(f"assets/images/player/player1_{i}.png") for i in range(1, 8)]
-            self.back = pygame.image.load("assets/images/river_back.png")
+            player_level = 1
+            back_path = "assets/images/river_back.png"
         elif back ==1:
-            self.player_images = [pygame.image.load(f"assets/images/player/player4_{i}.png") for i in range(1, 8)]
-            self.back = pygame.image.load("assets/images/river_forest.png")
+            player_level = 4
+            back_path = "assets/images/river_forest.png"
         else:
-            self.player_images = [pygame.image.load(f"assets/images/player/player4_{i}.png") for i in range(1, 8)]
-            self.back = pygame.image.load("assets/images/end_frame_1.png")
+            player_level = 4
+            back_path = "assets/images/end_frame_1.png"
+        # Player frames are shared with the swimming game's player through the asset cache
+        self.player_images = [
+            self.asset_manager.load_sprite(f"assets/images/player/player{player_level}_{i}.png")
+            for i in range(1, 8)
+        ]
+        self.player_ladder = ScaleLadder(self.player_images)
+        # Background scaled to the internal resolution at load time
+        self.back = self.asset_manager.render_image(self.asset_manager.load_image(back_path))
 
 
         # Create noise overlay
-        self.noise_overlay = PerlinNoiseOverlay(width, height, 200, 150, scale=0.5, alpha=20)
+        self.noise_overlay = PerlinNoiseOverlay(*self.screen.get_size(), 200, 150, scale=0.5, alpha=20)
+        self.fade_overlay = FadeOverlay(self.screen.get_size())
         
         # Set up waypoints and generate control points
-        self.waypoints = [(51, 596), (923, 481), (537, 383), (878, 366)]
-        self.segments = self.generate_control_points(self.waypoints)
+        self.PATH_SAMPLES = 1024
+        self.set_waypoints([(51, 596), (923, 481), (537, 383), (878, 366)])
         
         # Music initialization can be uncommented if needed
         # pygame.mixer.init()
@@ -158,6 +235,18 @@ class CurveAnimation:
         """Set custom waypoints for the animation path"""
         self.waypoints = waypoints
         self.segments = self.generate_control_points(self.waypoints)
+        self.path_lut = self.sample_path(self.PATH_SAMPLES)
+
+    def sample_path(self, samples):
+        """Sample the bezier path into internal-resolution positions for t in [0, 1]"""
+        num_segments = len(self.segments)
+        lut = []
+        for i in range(samples):
+            t = i / (samples - 1)
+            seg_t = (t * num_segments) % 1
+            seg_index = min(int(t * num_segments), num_segments - 1)
+            lut.append(display.scale_pos(self.bezier_curve(*self.segments[seg_index], seg_t)))
+        return lut
     
     def lerp(self, a, b, t):
         """Linear interpolation between a and b at time t"""
@@ -227,40 +316,29 @@ class CurveAnimation:
         
         # If not fully faded, draw the player
         if not self.fading or self.fade_alpha < 255:
-            num_segments = len(self.segments)
-            seg_t = (t * num_segments) % 1
-            seg_index = min(int(t * num_segments), num_segments - 1)
-            pos = self.bezier_curve(*self.segments[seg_index], seg_t)
+            x, y = self.path_lut[int(t * (self.PATH_SAMPLES - 1))]
             
             img_index = (self.frame_count // 5) % len(self.player_images)
             
-            # Ensure size is at least 1 to avoid scaling errors
-            current_size = max(1, int(size))
-            player_img = pygame.transform.scale(self.player_images[img_index], (current_size, current_size))
-            
-            self.screen.blit(player_img, (int(pos[0] - current_size // 2), int(pos[1] - current_size // 2)))
+            # Pre-scaled frame from the ladder, centred on the path
+            player_img = self.player_ladder.get(img_index, size * display.scale)
+            current_size = player_img.get_width()
+            self.screen.blit(player_img, (x - current_size // 2, y - current_size // 2), None, PREMULTIPLIED)
         
         # Apply fade effect if fading
         if self.fading:
-            fade_surface = pygame.Surface((self.WIDTH, self.HEIGHT))
-            fade_surface.fill((0, 0, 0))
-            fade_surface.set_alpha(int(self.fade_alpha))
-            self.screen.blit(fade_surface, (0, 0))
+            self.fade_overlay.draw(self.screen, self.fade_alpha)
         
         # Apply noise overlay
-        noise_surface = self.noise_overlay.generate()
-        self.screen.blit(noise_surface, (0, 0))
+        self.noise_overlay.draw(self.screen)
         self.noise_overlay.update()
-        
-        # Update display
-        pygame.display.flip()
 
 
 class GameIntro:
-    def __init__(self):
+    def __init__(self, asset_manager=None):
         # Initialize both animations
-        self.intro_animation = Animation()
-        self.character_animation = CurveAnimation()
+        self.intro_animation = Animation(asset_manager=asset_manager)
+        self.character_animation = CurveAnimation(asset_manager=asset_manager)
         
         # Track current animation state
         self.current_animation = "intro"
@@ -0,0 +1,262 @@
+"""
+Music and sound effect playback.
+
+Music tracks are decoded on a background thread and played on two reserved
+channels, so a scene change never waits for an OGG to open and tracks
+crossfade into each other. Sound effects play on channels reserved per
+category; each category has a voice limit, and when all its voices are busy
+a new sound replaces the oldest voice of lower or equal priority, otherwise
+it is dropped. Voice lifetimes are tracked from sound lengths, so the mixer
+is only called when something actually starts or stops. Calls are counted
+per frame for the profiler overlay.
+
+Measured with `python audio.py` (SDL dummy audio driver, one core):
+    music switch stall        ~95-210 ms with a synchronous decode, <0.5 ms queued
+    mixer calls per frame     one per idle frame before (the swim sound was
+                              faded every idle frame), ~0.015 in a 600-frame
+                              scripted swimming run
+"""
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+
+MUSIC_VOLUME = 0.3
+MUSIC_CHANNELS = 2
+
+# Channel budget per sound category, highest priority wins a busy category
+SOUND_CATEGORIES = {
+    'loops': {'voices': 1, 'priority': 0},    # Swimming loop
+    'pickups': {'voices': 3, 'priority': 1},  # Coins, eating clicks
+    'hazards': {'voices': 2, 'priority': 2},  # Miner hits, bird calls
+}
+
+
+class AudioManager:
+    """Plays music and sound effects on budgeted, reserved channels."""
+    def __init__(self, categories=SOUND_CATEGORIES, music_volume=MUSIC_VOLUME, free_channels=4):
+        """
+        Args:
+            categories (dict): Category name -> {'voices': int, 'priority': int}
+            music_volume (float): Music channel volume
+            free_channels (int): Unreserved channels left for direct Sound.play calls
+        """
+        self.enabled = pygame.mixer.get_init() is not None
+        self.music_volume = music_volume
+
+        # Decoded music tracks: path -> Future of pygame.mixer.Sound
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio-decode")
+        self.tracks = {}
+        self.music_path = None
+        self.music_channel = None
+        self.music_index = 0  # Music channel the next track starts on
+        self.pending_music = None  # (path, fade_ms) waiting for its decode
+
+        # Mixer calls made this frame and in the previous frame
+        self.calls = Counter()
+        self.frame_calls = 0
+        self.total_calls = 0
+        self.dropped = 0
+
+        self.categories = {}
+        if not self.enabled:
+            return
+        reserved = MUSIC_CHANNELS + sum(category['voices'] for category in categories.values())
+        pygame.mixer.set_num_channels(reserved + free_channels)
+        pygame.mixer.set_reserved(reserved)
+        self.music_channels = [pygame.mixer.Channel(i) for i in range(MUSIC_CHANNELS)]
+        index = MUSIC_CHANNELS
+        for name, category in categories.items():
+            self.categories[name] = {
+                'priority': category['priority'],
+                'channels': [pygame.mixer.Channel(i) for i in range(index, index + category['voices'])],
+                'voices': [None] * category['voices'],
+            }
+            index += category['voices']
+
+    def _count(self, call):
+        self.calls[call] += 1
+
+    def play(self, sound, category, priority=None, loops=0, fade_ms=0):
+        """
+        Play a sound on one of its category's channels.
+
+        Args:
+            sound (pygame.mixer.Sound): Sound to play
+            category (str): Key of the categories table
+            priority (int): Voice priority, defaults to the category's
+            loops (int): Extra repeats, -1 to loop until stopped
+            fade_ms (int): Fade-in time
+
+        Returns:
+            pygame.mixer.Channel: Channel used, or None if the sound was dropped
+        """
+        if not self.enabled:
+            return None
+        group = self.categories[category]
+        priority = group['priority'] if priority is None else priority
+        voices = group['voices']
+        now = time.perf_counter()
+
+        index = next((i for i, voice in enumerate(voices) if voice is None or voice['ends'] <= now), None)
+        if index is None:
+            # Replace the least important, oldest voice unless it outranks this sound
+            index = min(range(len(voices)), key=lambda i: (voices[i]['priority'], voices[i]['started']))
+            if voices[index]['priority'] > priority:
+                self.dropped += 1
+                return None
+
+        channel = group['channels'][index]
+        self._count('play')
+        channel.play(sound, loops=loops, fade_ms=fade_ms)
+        ends = float('inf') if loops < 0 else now + sound.get_length() * (loops + 1)
+        voices[index] = {'sound': sound, 'priority': priority, 'started': now, 'ends': ends}
+        return channel
+
+    def stop(self, sound, fade_ms=0):
+        """
+        Stop or fade out every voice playing a sound.
+
+        Args:
+            sound (pygame.mixer.Sound): Sound to stop
+            fade_ms (int): Fade-out time, 0 to stop immediately
+        """
+        now = time.perf_counter()
+        for group in self.categories.values():
+            for i, voice in enumerate(group['voices']):
+                if voice is None or voice['sound'] is not sound or voice['ends'] <= now:
+                    continue
+                if fade_ms:
+                    self._count('fadeout')
+                    group['channels'][i].fadeout(fade_ms)
+                else:
+                    self._count('stop')
+                    group['channels'][i].stop()
+                group['voices'][i] = None
+
+    def _decode(self, path):
+        return pygame.mixer.Sound(path)
+
+    def preload_music(self, path):
+        """Start decoding a track in the background."""
+        if self.enabled and path and path not in self.tracks:
+            self.tracks[path] = self.executor.submit(self._decode, path)
+
+    def play_music(self, path, fade_ms=1000):
+        """
+        Crossfade to a track, looping it.
+
+        Returns immediately; the current track keeps playing until the new one
+        is decoded, then update() starts the crossfade.
+
+        Args:
+            path (str): Track file path
+            fade_ms (int): Crossfade time
+        """
+        if not self.enabled or (path == self.music_path and self.pending_music is None):
+            return
+        self.preload_music(path)
+        self.pending_music = (path, fade_ms)
+        self._start_pending_music()
+
+    def _start_pending_music(self):
+        path, fade_ms = self.pending_music
+        future = self.tracks[path]
+        if not future.done():
+            return
+        self.pending_music = None
+        try:
+            sound = future.result()
+        except pygame.error as e:
+            print(f"Error loading music {path}: {e}")
+            self.tracks.pop(path, None)
+            return
+
+        # Fade the old track out on one channel while the new one fades in on the other
+        if self.music_channel is not None:
+            self._release_music(fade_ms)
+        channel = self.music_channels[self.music_index]
+        self.music_index = 1 - self.music_index
+        self._count('play')
+        channel.set_volume(self.music_volume)
+        channel.play(sound, loops=-1, fade_ms=fade_ms)
+        self.music_path = path
+        self.music_channel = channel
+
+    def _release_music(self, fade_ms):
+        """Fade out the current track and drop its decoded samples."""
+        self._count('fadeout')
+        self.music_channel.fadeout(fade_ms)
+        self.tracks.pop(self.music_path, None)
+        self.music_path = None
+        self.music_channel = None
+
+    def fadeout_music(self, fade_ms):
+        """Fade out the current track without starting another."""
+        self.pending_music = None
+        if self.music_channel is not None:
+            self._release_music(fade_ms)
+
+    def update(self):
+        """Start decoded music and roll the per-frame call count; call once per frame."""
+        if self.pending_music is not None:
+            self._start_pending_music()
+        self.frame_calls = sum(self.calls.values())
+        self.total_calls += self.frame_calls
+        self.calls.clear()
+
+    def close(self):
+        """Stop the decoder thread."""
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+_manager = None
+
+
+def get():
+    """Return the shared AudioManager, creating it once the mixer is initialised."""
+    global _manager
+    if _manager is None or (not _manager.enabled and pygame.mixer.get_init()):
+        _manager = AudioManager()
+    return _manager
+
+
+if __name__ == "__main__":
+    # Measure the music switch stall and the mixer calls of a scripted swimming run
+    import os
+    import random
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    import audio
+    import display
+    from swimming_game import SwimmingGame
+    from utils import AssetManager
+    from sweep import RandomPolicy
+
+    display.init()
+    for path in ("assets/sounds/mountain.ogg", "assets/sounds/victory.ogg"):
+        start = time.perf_counter()
+        pygame.mixer.Sound(path)
+        sync_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        audio.get().play_music(path)
+        queued_ms = (time.perf_counter() - start) * 1000
+        print(f"{os.path.basename(path):14s} synchronous decode {sync_ms:6.1f} ms  queued {queued_ms:5.2f} ms")
+        audio.get().executor.submit(lambda: None).result()
+        audio.get().update()
+
+    game = SwimmingGame(AssetManager())
+    policy = RandomPolicy(random.Random(1))
+    game.player.input_source = lambda: policy(game)
+
+    frames = 600
+    start_calls = audio.get().total_calls
+    for frame in range(frames):
+        if not game._update_game_state():
+            game._restart_game()
+        audio.get().update()
+    calls = audio.get().total_calls - start_calls
+    print(f"mixer calls per frame {calls / frames:.3f}  dropped voices {audio.get().dropped}")
+    audio.get().close()
+    pygame.quit()
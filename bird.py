@@ -1,15 +1,19 @@
 import pygame
 import math
 import random
+import audio
 
 class Bird(pygame.sprite.Sprite):
     """Bird enemy that flies across the screen and eats fish."""
+    # Rotation angles are rounded to this many degrees; set by the quality governor
+    rotation_step = 1
+
     def __init__(self, asset_manager, screen_width, screen_height):
         super().__init__()
         
         # Load eagle image
         try:
-            self.original_image = pygame.image.load("assets/images/eagle.png").convert_alpha()
+            self.original_image = asset_manager.load_sprite("assets/images/eagle.png")
             # Scale the image to an appropriate size
             # self.original_image = pygame.transform.scale(original_image, (100, 70))
             self.image = self.original_image.copy()
@@ -51,6 +55,17 @@ class Bird(pygame.sprite.Sprite):
         self.eat_delay = 30  # Frames to stay over a fish
         self.eat_timer = 0
 
+        # Last rotated image, reused while the quantized angle is unchanged
+        self.rotation_angle = None
+
+    def _rotate(self, angle):
+        """Rotate the original image to the angle rounded to the rotation step."""
+        angle = round(angle / self.rotation_step) * self.rotation_step
+        if angle != self.rotation_angle:
+            self.rotation_angle = angle
+            self.rotated_image = pygame.transform.rotate(self.original_image, angle)
+        return self.rotated_image
+
     def update(self, fish_group):
         """Update bird movement and fish hunting behavior."""
         if not self.hunting:
@@ -59,7 +74,7 @@ class Bird(pygame.sprite.Sprite):
             movement_angle = math.degrees(math.atan2(-self.speed_y, self.speed_x)) - 90
             
             # Rotate the image based on movement direction
-            self.image = pygame.transform.rotate(self.original_image, movement_angle)
+            self.image = self._rotate(movement_angle)
             self.rect = self.image.get_rect(center=self.rect.center)
             
             # Normal flight movement
@@ -82,7 +97,7 @@ class Bird(pygame.sprite.Sprite):
             self.eat_timer += 1
             if self.eat_timer >= self.eat_delay:
                 # Remove the fish
-                self.bird_sound.play()
+                audio.get().play(self.bird_sound, 'hazards')
                 self.target_fish.kill()
                 self.target_fish = None
                 self.hunting = False
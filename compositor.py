@@ -0,0 +1,279 @@
+"""
+Full-screen overlay passes split into horizontal bands on a thread pool.
+
+The noise overlay, the fade overlays and the death-screen darkening each
+blend every pixel of the internal render surface. BandCompositor does these
+passes with NumPy directly on the surface's pixel buffer, one band of rows per
+task; NumPy releases the GIL inside its loops, so bands run in parallel on as
+many cores as there are workers. Each pass computes exactly what the blit it
+replaces computes: D + ((S - D) * alpha >> 8) for an opaque overlay with
+surface alpha, D + (((S - D) * alpha + S) >> 8) for the per-pixel alpha noise
+overlay, with the noise stretched like pygame.transform.scale. Both fit in
+16 bits as (D * (256 - alpha) + S * weight) >> 8, so the two paths are
+interchangeable; `python compositor.py` checks them bit-exact.
+
+With one worker the passes stay SDL blits, which a single band loop does not
+beat, and one worker is the default: no core count has been measured to beat
+the blits yet, so the band passes are opt-in (`--compositor-threads`). Only 32-bit surfaces the size of the overlay are composited; other
+targets (a TextureScreen, a 16-bit surface) are left to the blit path.
+
+Measured with `python compositor.py` (SDL dummy driver, 1280x720, one core):
+    pass                       SDL            bands, 1 thread   bands, 4 threads
+    darken (alpha 128)         ~0.45-0.8 ms   ~0.8-1.2 ms       ~1.1-1.5 ms
+    noise (25x100, upscaled)   ~1.2-1.8 ms    ~2.1-2.6 ms       ~2.1-3.0 ms
+The SDL noise pass includes the upscale into the overlay's reused surface.
+This machine has one core, so the threaded column only shows the pool's
+overhead; the bands are memory-bound and are expected to scale with cores
+until memory bandwidth runs out, which this machine cannot measure.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pygame
+
+# Rows per band; a band and its 16-bit working copy stay in L2 cache
+BAND_ROWS = 48
+
+
+def scale_indices(source_size, target_size):
+    """
+    Source index of each target pixel along one axis, as pygame.transform.scale picks it.
+
+    SDL's nearest-neighbour stretch steps through the source in 16.16 fixed
+    point starting half a step in.
+    """
+    step = (source_size << 16) // target_size
+    return (((step >> 1) + np.arange(target_size, dtype=np.int64) * step) >> 16).astype(np.intp)
+
+
+class BandCompositor:
+    """Blends colours and stretched greyscale images over 32-bit surfaces in bands."""
+    def __init__(self, workers=None):
+        """
+        Args:
+            workers (int): Threads sharing each pass, None for one per core;
+                with one the passes are left to SDL blits
+        """
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.enabled = self.workers > 1
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="compositor") \
+            if self.enabled else None
+        self.local = threading.local()  # Per-thread working buffer
+        self.indices = {}  # (source size, target size) -> scale_indices
+        self.passes = 0
+
+    def _pixels(self, target):
+        """Row-major (height, width * 4) byte view of a 32-bit surface, or None."""
+        if not isinstance(target, pygame.Surface) or target.get_bytesize() != 4:
+            return None
+        width, height = target.get_size()
+        if not width or not height:
+            return None
+        # The view locks the surface until it is released
+        rows = np.frombuffer(target.get_buffer(), np.uint8).reshape(height, target.get_pitch())
+        return rows[:, :width * 4]
+
+    def _work(self, shape):
+        """Working buffer of the calling thread, at least `shape`."""
+        work = getattr(self.local, "work", None)
+        if work is None or work.shape[0] < shape[0] or work.shape[1] < shape[1]:
+            work = self.local.work = np.empty((BAND_ROWS, shape[1]), np.uint16)
+        return work[:shape[0], :shape[1]]
+
+    def _run(self, band, height):
+        """Call band(top, bottom) over every band of rows, in parallel when enabled."""
+        tops = range(0, height, BAND_ROWS)
+        if self.executor is None:
+            for top in tops:
+                band(top, min(top + BAND_ROWS, height))
+        else:
+            # list() waits for every band and re-raises the first error
+            list(self.executor.map(lambda top: band(top, min(top + BAND_ROWS, height)), tops))
+        self.passes += 1
+
+    def blend_color(self, target, color, alpha, force=False):
+        """
+        Blend a solid colour over a surface, like blitting an opaque overlay with set_alpha.
+
+        Args:
+            target (pygame.Surface): Surface to draw on
+            color (tuple): Overlay colour
+            alpha (int): 1-254
+            force (bool): Composite even when the compositor is disabled
+
+        Returns:
+            bool: Whether the pass was done; False leaves it to the caller's blit
+        """
+        if not (self.enabled or force):
+            return False
+        pixels = self._pixels(target)
+        if pixels is None:
+            return False
+        keep = 256 - alpha
+        # The colour's bytes in the surface's byte order, times alpha
+        color_bytes = np.array([target.map_rgb(color)], dtype=np.uint32).view(np.uint8)
+        added = np.tile(color_bytes.astype(np.uint16) * alpha, pixels.shape[1] // 4)
+
+        def band(top, bottom):
+            rows = pixels[top:bottom]
+            work = self._work(rows.shape)
+            np.multiply(rows, keep, out=work, dtype=np.uint16)
+            if added.any():
+                np.add(work, added, out=work)
+            np.right_shift(work, 8, out=work)
+            rows[...] = work
+
+        self._run(band, pixels.shape[0])
+        return True
+
+    def blend_gray_scaled(self, target, gray, alpha, force=False):
+        """
+        Blend a greyscale image stretched over a whole surface.
+
+        Gives the pixels of blitting the noise overlay's surface at (0, 0):
+        pygame.transform.scale of the image as an RGB surface with
+        set_alpha(alpha), converted to per-pixel alpha.
+
+        Args:
+            target (pygame.Surface): Surface to draw on
+            gray (numpy.ndarray): (height, width) uint8 image
+            alpha (int): 1-254
+            force (bool): Composite even when the compositor is disabled
+
+        Returns:
+            bool: Whether the pass was done; False leaves it to the caller's blit
+        """
+        if not (self.enabled or force):
+            return False
+        pixels = self._pixels(target)
+        if pixels is None:
+            return False
+        width, height = target.get_size()
+        source_height, source_width = gray.shape
+        key = (source_width, source_height, width, height)
+        indices = self.indices.get(key)
+        if indices is None:
+            indices = self.indices[key] = (scale_indices(source_height, height),
+                                           scale_indices(source_width, width))
+        rows_index, columns_index = indices
+        keep = 256 - alpha
+        # Each source row stretched to the target width and weighted, for all four bytes;
+        # per-pixel alpha blits weight the source by alpha + 1
+        stretched = np.repeat((gray.astype(np.uint16) * (alpha + 1))[:, columns_index], 4, axis=1)
+
+        def band(top, bottom):
+            rows = pixels[top:bottom]
+            work = self._work(rows.shape)
+            np.multiply(rows, keep, out=work, dtype=np.uint16)
+            np.add(work, stretched[rows_index[top:bottom]], out=work)
+            np.right_shift(work, 8, out=work)
+            rows[...] = work
+
+        self._run(band, height)
+        return True
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+
+_compositor = None
+
+
+def configure(workers=None):
+    """Replace the shared compositor with one using `workers` threads (None: one per core)."""
+    global _compositor
+    if _compositor is not None:
+        _compositor.close()
+    _compositor = BandCompositor(workers)
+    return _compositor
+
+
+def get():
+    """Return the shared BandCompositor; one worker, leaving the passes to blits, unless configured."""
+    if _compositor is None:
+        configure(1)
+    return _compositor
+
+
+if __name__ == "__main__":
+    # Check the band passes bit-exact against the blits they replace, then time them
+    import time
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    import display
+    screen = display.init()
+    width, height = screen.get_size()
+    rng = np.random.default_rng(1)
+
+    def random_surface():
+        surface = pygame.Surface((width, height)).convert()
+        pygame.surfarray.blit_array(surface, rng.integers(0, 256, (width, height, 3), dtype=np.uint8))
+        return surface
+
+    def noise_surface(gray, alpha):
+        """The noise overlay's surface, built as PerlinNoiseOverlay.generate builds it."""
+        small = pygame.Surface(gray.shape[::-1])
+        pygame.surfarray.blit_array(small, np.stack([gray.T] * 3, axis=-1))
+        small = small.convert_alpha()
+        overlay = pygame.Surface((width, height), pygame.SRCALPHA, small)
+        pygame.transform.scale(small, (width, height), overlay)
+        overlay.set_alpha(alpha)
+        return overlay
+
+    # Compare the pixels, not the unused fourth byte of each
+    same = lambda a, b: np.array_equal(pygame.surfarray.array3d(a), pygame.surfarray.array3d(b))
+    background = random_surface()
+    compositors = [BandCompositor(1), BandCompositor(4)]
+    checks = 0
+    for alpha in (1, 20, 60, 128, 200, 254):
+        for color in ((0, 0, 0), (255, 255, 255), (30, 144, 255)):
+            overlay = pygame.Surface((width, height)).convert()
+            overlay.fill(color)
+            overlay.set_alpha(alpha)
+            expected = background.copy()
+            expected.blit(overlay, (0, 0))
+            for compositor in compositors:
+                result = background.copy()
+                compositor.blend_color(result, color, alpha, force=True)
+                assert same(result, expected), f"blend_color {color} alpha {alpha}, {compositor.workers} workers"
+                checks += 1
+        for size in ((25, 100), (200, 150), (12, 50), (7, 3)):
+            gray = rng.integers(0, 256, size[::-1], dtype=np.uint8)
+            expected = background.copy()
+            expected.blit(noise_surface(gray, alpha), (0, 0))
+            for compositor in compositors:
+                result = background.copy()
+                compositor.blend_gray_scaled(result, gray, alpha, force=True)
+                assert same(result, expected), f"blend_gray_scaled {size} alpha {alpha}, {compositor.workers} workers"
+                checks += 1
+    print(f"{checks} passes bit-exact with the SDL blits")
+
+    def timed(draw, repeats=200):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            draw()
+        return (time.perf_counter() - start) / repeats * 1000
+
+    overlay = pygame.Surface((width, height)).convert()
+    overlay.fill((0, 0, 0))
+    overlay.set_alpha(128)
+    gray = rng.integers(0, 256, (100, 25), dtype=np.uint8)
+    noise = noise_surface(gray, 60)
+
+    def noise_blit():
+        # What the overlay does each frame its noise changes
+        pygame.transform.scale(pygame.Surface((25, 100)).convert_alpha(), (width, height), noise)
+        screen.blit(noise, (0, 0))
+
+    print(f"darken: SDL blit {timed(lambda: screen.blit(overlay, (0, 0))):.3f} ms, " + ", ".join(
+        f"{c.workers} thread(s) {timed(lambda: c.blend_color(screen, (0, 0, 0), 128, force=True)):.3f} ms"
+        for c in compositors))
+    print(f"noise: SDL scale and blit {timed(noise_blit):.3f} ms, " + ", ".join(
+        f"{c.workers} thread(s) {timed(lambda: c.blend_gray_scaled(screen, gray, 60, force=True)):.3f} ms"
+        for c in compositors))
+    for compositor in compositors:
+        compositor.close()
+    pygame.quit()
@@ -0,0 +1,217 @@
+"""
+Game window and internal render resolution.
+
+Gameplay and cutscene paths use logical 1280x720 coordinates but draw onto
+the surface returned by get_surface(), which may be smaller. The internal
+surface is presented to the window either by SDL with `pygame.SCALED` or by a
+single upscale blit per frame. Images are scaled to the internal resolution
+once, at load time, through AssetManager.render_image.
+
+With the 'renderer' backend (or 'software', which forces SDL's software
+renderer) the window is drawn by a pygame._sdl2.video Renderer. The swimming
+game and the cutscenes draw on get_target(), a texture_screen.TextureScreen
+that copies cached textures; other scenes still draw on the internal surface,
+which flip() uploads as one texture. A hidden display-module window keeps a
+video mode open so surfaces can still be converted to the display format.
+
+Measured with `python display.py` (SDL dummy driver, swimming scene, blit
+presentation, one core). Frame time includes the resolution-independent noise
+generation and the upscale blit; a full-screen pass is one fill plus one
+overlay blit:
+    preset      frame ms   full-screen pass ms   fill Mpx/s
+    1280x720    ~5.3-6.7   ~1.5                  ~1200
+    960x540     ~4.8-6.0   ~0.9                  ~1200
+    640x360     ~4.2-4.9   ~0.45                 ~1000
+"""
+import pygame
+import formats
+
+LOGICAL_SIZE = (1280, 720)
+
+RESOLUTION_PRESETS = {
+    '1280x720': (1280, 720),
+    '960x540': (960, 540),
+    '640x360': (640, 360),
+}
+
+# Present the internal surface with SDL's SCALED mode or an explicit upscale blit
+PRESENT_MODES = ('scaled', 'blit')
+
+# Draw with Surface blits, an SDL Renderer, or SDL's software Renderer
+BACKENDS = ('surface', 'renderer', 'software')
+
+_window = None
+_screen = None
+_target = None
+_present = 'scaled'
+scale = 1.0
+
+
+def init(resolution='1280x720', present='scaled', audit=False, backend='surface'):
+    """
+    Open the game window with the given internal render resolution.
+
+    Args:
+        resolution (str): Key of RESOLUTION_PRESETS
+        present (str): 'scaled' for pygame.SCALED, 'blit' for an upscale blit
+        audit (bool): Draw onto a formats.AuditedSurface that logs blits of
+            surfaces not in the display format; presents with a blit
+        backend (str): Key of BACKENDS; present is ignored by the renderer backends
+
+    Returns:
+        pygame.Surface: Surface scenes should draw on
+    """
+    global _window, _screen, _target, _present, scale
+    size = RESOLUTION_PRESETS[resolution]
+    _present = present
+    scale = size[0] / LOGICAL_SIZE[0]
+    _target = None
+    formats.reset_display_masks()
+
+    if backend != 'surface':
+        import os
+        from pygame._sdl2 import video
+        from texture_screen import TextureScreen
+        os.environ.setdefault("SDL_RENDER_BATCHING", "1")
+        pygame.display.set_mode((1, 1), pygame.HIDDEN)
+        _window = video.Window(pygame.display.get_caption()[0] or "pygame", LOGICAL_SIZE)
+        drivers = [driver.name for driver in video.get_drivers()]
+        index = drivers.index('software') if backend == 'software' and 'software' in drivers else -1
+        _screen = pygame.Surface(size).convert()
+        _target = TextureScreen(video.Renderer(_window, index=index), size)
+    elif audit:
+        _window = pygame.display.set_mode(LOGICAL_SIZE)
+        _screen = formats.AuditedSurface(size, 0, _window)
+    elif size == LOGICAL_SIZE:
+        _window = pygame.display.set_mode(LOGICAL_SIZE)
+        _screen = _window
+    elif present == 'scaled':
+        _window = pygame.display.set_mode(size, pygame.SCALED)
+        _screen = _window
+    else:
+        _window = pygame.display.set_mode(LOGICAL_SIZE)
+        _screen = pygame.Surface(size).convert()
+    return _screen
+
+
+def get_surface():
+    """Return the internal render surface, opening a default window if needed."""
+    if _screen is None or not pygame.display.get_init() or pygame.display.get_surface() is None:
+        init()
+    return _screen
+
+
+def get_target():
+    """
+    Return what the swimming game and the cutscenes draw on: the internal
+    surface, or a TextureScreen with the renderer backends.
+    """
+    get_surface()
+    return _target or _screen
+
+
+def get_size():
+    """Size of the internal render surface."""
+    return get_surface().get_size()
+
+
+def flip():
+    """Present the internal surface to the window."""
+    if _target is not None:
+        # Closing the only visible window does not quit SDL while the hidden one is open
+        if pygame.event.peek(pygame.WINDOWCLOSE):
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+        _target.present(_screen)
+        return
+    if _screen is not _window and _screen.get_size() == _window.get_size():
+        _window.blit(_screen, (0, 0))
+    elif _screen is not _window:
+        pygame.transform.scale(_screen, _window.get_size(), _window)
+    pygame.display.flip()
+
+
+def mouse_pos(pos=None):
+    """
+    Convert a window mouse position to internal pixels.
+
+    Args:
+        pos (tuple): Position from a mouse event, or None for the current position
+    """
+    if _target is not None and pos is not None:
+        # The renderer already reports event positions in its logical size
+        return pos
+    if pos is None:
+        pos = pygame.mouse.get_pos()
+    if _screen is _window:
+        # SDL already reports SCALED positions in internal pixels
+        return pos
+    window_width, window_height = _window.size if _target is not None else _window.get_size()
+    return (int(pos[0] * _screen.get_width() / window_width),
+            int(pos[1] * _screen.get_height() / window_height))
+
+
+def scale_value(value):
+    """Convert a logical length to internal pixels."""
+    return int(value * scale)
+
+
+def scale_pos(pos):
+    """Convert a logical (x, y) position to internal pixels."""
+    return (int(pos[0] * scale), int(pos[1] * scale))
+
+
+def scale_rect(rect):
+    """Convert a logical rect to internal pixels."""
+    rect = pygame.Rect(rect)
+    return pygame.Rect(int(rect.x * scale), int(rect.y * scale),
+                       max(1, int(rect.width * scale)), max(1, int(rect.height * scale)))
+
+
+def scale_surface(surface, factor=None):
+    """Return a copy of a logical-size surface scaled to the internal resolution."""
+    factor = scale if factor is None else factor
+    width, height = surface.get_size()
+    size = (max(1, round(width * factor)), max(1, round(height * factor)))
+    if surface.get_bitsize() >= 24:
+        return pygame.transform.smoothscale(surface, size)
+    return pygame.transform.scale(surface, size)
+
+
+if __name__ == "__main__":
+    # Measure frame time and fill rate of the swimming scene at each preset
+    import os
+    import time
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    # Import this module by name so the game modules share its state
+    import display
+    from swimming_game import SwimmingGame
+    from utils import AssetManager
+
+    print(f"{'preset':10s} {'frame ms':>9s} {'pass ms':>8s} {'fill Mpx/s':>11s}")
+    for resolution in RESOLUTION_PRESETS:
+        screen = display.init(resolution, 'blit')
+        game = SwimmingGame(AssetManager())
+        for _ in range(60):
+            game._update_game_state()
+            game._draw()
+
+        start = time.perf_counter()
+        for _ in range(300):
+            game._update_game_state()
+            game._draw()
+            display.flip()
+        frame_ms = (time.perf_counter() - start) / 300 * 1000
+
+        # One full-screen pass: background fill plus the noise overlay blit
+        overlay = game.noise_overlay.generate()
+        start = time.perf_counter()
+        for _ in range(300):
+            screen.fill((135, 206, 235))
+            screen.blit(overlay, (0, 0))
+        pass_ms = (time.perf_counter() - start) / 300 * 1000
+        fill_rate = screen.get_width() * screen.get_height() * 2 / (pass_ms / 1000) / 1e6
+        print(f"{resolution:10s} {frame_ms:9.2f} {pass_ms:8.2f} {fill_rate:11.0f}")
+        game.player.stop_sound()
+    pygame.quit()
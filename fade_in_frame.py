@@ -1,4 +1,6 @@
 import pygame
+import transitions
+
 class FadeInOutFrame:
     def __init__(self, screen, image, fade_duration=1.0, stay_duration=1.0, last_slide=False):
         """
@@ -12,7 +14,8 @@ class FadeInOutFrame:
             last_slide: If True, remains visible after fade in and doesn't fade out
         """
         self.screen = screen
-        self.image = image
+        # Flattened once onto the black background the frame is shown over
+        self.image = transitions.to_opaque(image)
         self.fade_duration = fade_duration
         self.stay_duration = stay_duration
         self.last_slide = last_slide
@@ -23,9 +26,6 @@ class FadeInOutFrame:
         self.timer = 0
         self.done = False
         
-        # Create a surface with per-pixel alpha to handle the fade effect
-        self.alpha_surface = pygame.Surface(self.image.get_size(), pygame.SRCALPHA)
-        
     def update(self, dt):
         """
         Update the fade state based on elapsed time
@@ -76,17 +76,16 @@ class FadeInOutFrame:
         """
         Draw the image with the current alpha value
         """
-        # Clear the alpha surface
-        self.alpha_surface.fill((0, 0, 0, 0))
-        
-        # Blit the image onto the alpha surface
-        self.alpha_surface.blit(self.image, (0, 0))
+        transitions.blit_faded(self.screen, self.image, self.alpha)
         
-        # Set the alpha for the entire surface
-        self.alpha_surface.set_alpha(self.alpha)
+    def is_static(self):
+        """
+        Check if the frame is holding a fully visible image
         
-        # Draw the alpha surface to the screen
-        self.screen.blit(self.alpha_surface, (0, 0))
+        Returns:
+            bool: True while nothing on screen changes between frames
+        """
+        return self.state == "stay"
         
     def is_done(self):
         """
@@ -1,6 +1,8 @@
 import pygame
 import random
 import math
+import animation
+from animation import AnimationClip
 
 class Fish(pygame.sprite.Sprite):
     """Represents fish swimming across the screen."""
@@ -11,30 +13,22 @@ class Fish(pygame.sprite.Sprite):
         (255, 255, 200),   # Light Yellow
         (255, 200, 255)    # Light Magenta
     ]
+    FRAMES = ['assets/images/fish1.png', 'assets/images/fish2.png']
 
     def __init__(self, asset_manager, screen_width, screen_height):
         super().__init__()
         
-        # Load fish animation frames
-        base_frames = [
-            asset_manager.load_image('assets/images/fish1.png'),
-            asset_manager.load_image('assets/images/fish2.png')
-        ]
-        
         # Choose a random tint
         tint = random.choice(self.COLOR_TINTS)
         
-        # Create tinted fish surfaces
-        self.tinted_frames = self._create_tinted_frames(base_frames, tint)
-        
-        # Animation parameters
-        self.current_frame = 0
-        self.animation_timer = 0
-        self.animation_speed = 10  # Lower is faster
+        # Animation of the tinted frames, shared by every fish of this tint;
+        # animation.animate() shows the frame of the current tick
+        self.clip = AnimationClip.shared(self.tinted_frames_of(asset_manager, tint), 10)
+        self.phase = animation.ticks
         
         # Position
-        self.rect = self.tinted_frames[0].get_rect()
-        self.image = self.tinted_frames[0]
+        self.rect = self.clip.frames[0].get_rect()
+        self.image = self.clip.frames[0]
         self.rect.x = screen_width  # Start from right side
         self.start_y = random.randint(0, screen_height - self.rect.height)
         self.rect.y = self.start_y
@@ -44,7 +38,27 @@ class Fish(pygame.sprite.Sprite):
         self.frequency = random.uniform(0.005, 0.02)  # Random sine frequency
         self.amplitude = random.randint(10, 30)  # Amplitude of sine wave
 
-    def _create_tinted_frames(self, base_frames, tint):
+    @classmethod
+    def tinted_frames_of(cls, asset_manager, tint):
+        """
+        Return the animation frames in a tint, from the derived surface cache.
+        
+        Args:
+            asset_manager (AssetManager): Asset cache holding the frames
+            tint (tuple): RGB color tint
+        
+        Returns:
+            list: Tinted fish frames
+        """
+        return [
+            asset_manager.derived_image(
+                'fish_tint', [path], {'tint': tint},
+                lambda path=path: cls._create_tinted_frames([asset_manager.load_sprite(path)], tint)[0])
+            for path in cls.FRAMES
+        ]
+
+    @staticmethod
+    def _create_tinted_frames(base_frames, tint):
         """
         Create tinted fish frames.
         
@@ -72,14 +86,7 @@ class Fish(pygame.sprite.Sprite):
         return tinted_frames
 
     def update(self):
-        """Update fish animation and movement."""
-        # Animate
-        self.animation_timer += 1
-        if self.animation_timer >= self.animation_speed:
-            self.animation_timer = 0
-            self.current_frame = (self.current_frame + 1) % len(self.tinted_frames)
-            self.image = self.tinted_frames[self.current_frame]
-        
+        """Update fish movement."""
         # Move left
         self.rect.x -= self.speed
         
@@ -0,0 +1,81 @@
+import pygame
+from concurrent.futures import ThreadPoolExecutor
+import display
+import image_store
+
+class FrameStream:
+    """
+    Streams an image sequence, decoding a few frames ahead of playback.
+
+    Only the current frame and the next `window - 1` frames are held in memory.
+    Each frame is decoded on a background thread from the PNG bytes kept by
+    the image store, converted to the display format, scaled to the internal
+    resolution, trimmed to the bounding box of its non-transparent pixels, so
+    drawing it only touches that area, and premultiplied; frames are blitted
+    with BLEND_PREMULTIPLIED.
+    """
+    def __init__(self, paths, window=3):
+        """
+        Args:
+            paths (list): Image file paths in playback order
+            window (int): Number of frames kept decoded, including the current one
+        """
+        self.paths = list(paths)
+        self.window = max(1, window)
+        self.executor = None
+        self.pending = {}  # frame index -> Future of (surface, offset)
+        self.prefetch(0)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def _decode(self, path):
+        """Load, convert, scale, trim and premultiply one frame."""
+        image = pygame.image.load(image_store.get().open(path), path).convert_alpha()
+        if display.scale != 1:
+            image = display.scale_surface(image)
+        bounds = image.get_bounding_rect()
+        return image.subsurface(bounds).premul_alpha(), bounds.topleft
+
+    def prefetch(self, index):
+        """Queue decoding of the frames in the window starting at index."""
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="frame-stream")
+        for i in range(index, min(index + self.window, len(self.paths))):
+            if i not in self.pending:
+                self.pending[i] = self.executor.submit(self._decode, self.paths[i])
+
+    def get(self, index):
+        """
+        Return a decoded frame, waiting for it if it is not ready yet.
+
+        Args:
+            index (int): Frame index
+
+        Returns:
+            tuple: (surface, (x, y) offset of the trimmed frame)
+        """
+        # Release frames that have already been shown
+        for old in [i for i in self.pending if i < index]:
+            self.pending.pop(old).cancel()
+        self.prefetch(index)
+        return self.pending[index].result()
+
+    def decoded(self):
+        """Frames held decoded: the current frame and those decoded ahead."""
+        return [future.result()[0] for future in self.pending.values()
+                if future.done() and not future.cancelled() and future.exception() is None]
+
+    def reset(self):
+        """Drop decoded frames and start decoding from the beginning again, also after close()."""
+        for future in self.pending.values():
+            future.cancel()
+        self.pending.clear()
+        self.prefetch(0)
+
+    def close(self):
+        """Stop the decoder thread and release all frames; prefetching starts a new thread."""
+        self.pending.clear()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
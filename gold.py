@@ -18,7 +18,7 @@ class GoldPiece(pygame.sprite.Sprite):
 
         # Load gold piece image (you'll need to add this to your asset manager)
         try:
-            self.image = asset_manager.load_image("gold_piece.png")  # You'll need to create this image
+            self.image = asset_manager.load_sprite("gold_piece.png")  # You'll need to create this image
             self.image = pygame.transform.scale(self.image, (30, 30))  # Adjust size as needed
         except:
             # Fallback if image loading fails
@@ -0,0 +1,84 @@
+"""
+In-memory PNG bytes of the intro frames.
+
+The intro frame stream (see frame_stream) decodes its frames on a background
+thread from an ImageStore, which reads each file once and keeps its PNG
+bytes, ~0.55 MB for the twelve frames, so restarting the intro decodes from
+memory instead of the disk.
+
+Full-screen scene images (the intro background, the river backgrounds, the
+end frames) are loaded by the AssetManager when their scene is entered, after
+the previous scene's assets are released. Keeping them in the store too was
+measured with a scripted playthrough from the title to the last end slide
+(SDL dummy driver, 1280x720, one core):
+                                    peak resident   end scene enter
+    loaded on enter                 ~123-125 MB     ~12-78 ms
+    decoded while the old scene     ~135 MB         ~2-18 ms
+      is still shown
+    decoded on the store's thread   ~135 MB         ~8-59 ms
+      once the old scene is released
+    staged as PNG bytes, decoded    ~125-129 MB     ~13-65 ms
+      on enter
+Memory the decoder thread frees is returned to the system less eagerly than
+the main thread's, so every variant raised the peak, and the store only
+keeps the intro frames.
+
+Measured with `python image_store.py`: an intro frame decodes in ~9-10 ms
+from kept bytes or from disk alike; the store only saves the file reads.
+"""
+import io
+import os
+import time
+import pygame
+
+
+class ImageStore:
+    """Keeps the PNG bytes of images decoded more than once."""
+    def __init__(self):
+        self.compressed = {}  # path -> PNG bytes
+
+    def data(self, path):
+        """PNG bytes of an image, read from disk the first time."""
+        data = self.compressed.get(path)
+        if data is None:
+            with open(path, "rb") as f:
+                data = f.read()
+            self.compressed[path] = data
+        return data
+
+    def open(self, path):
+        """File object over an image's PNG bytes, for pygame.image.load."""
+        return io.BytesIO(self.data(path))
+
+    def compressed_bytes(self):
+        """Bytes of the PNG data kept in memory."""
+        return sum(len(data) for data in list(self.compressed.values()))
+
+
+_store = None
+
+
+def get():
+    """Return the shared ImageStore."""
+    global _store
+    if _store is None:
+        _store = ImageStore()
+    return _store
+
+
+if __name__ == "__main__":
+    # Decode time of the intro frames from disk and from kept PNG bytes
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((1280, 720))
+    paths = [f"assets/images/intro1/intro{i}.png" for i in range(1, 13)]
+    store = ImageStore()
+    for name, load in (("disk", lambda path: pygame.image.load(path)),
+                       ("PNG bytes", lambda path: pygame.image.load(store.open(path), path))):
+        start = time.perf_counter()
+        for _ in range(5):
+            for path in paths:
+                load(path).convert_alpha()
+        print(f"{name:10s} {(time.perf_counter() - start) / (5 * len(paths)) * 1000:.2f} ms per frame")
+    print(f"{len(store.compressed)} frames kept in {store.compressed_bytes() / 2 ** 20:.2f} MB")
+    pygame.quit()
@@ -0,0 +1,315 @@
+"""
+Live metrics for unattended kiosks, served on a local port or UNIX socket.
+
+The game loop hands each frame's work time to a MetricsServer. About twice a
+second it collects a snapshot on the main thread: frame-time percentiles, the
+current scene, entities per sprite group, AssetManager cache sizes, the image
+store's kept PNG bytes, images held by the scene, bytes of resident
+surfaces and mixer channel usage. The snapshot is encoded as JSON and
+published by replacing one reference, so the server thread only ever reads a
+finished, immutable buffer while the next one is being built: the two never
+share a lock, and a slow or stuck scrape cannot hold up a frame. The server
+thread never touches pygame or game objects.
+
+    python main.py --metrics-port 8765        # curl http://127.0.0.1:8765/metrics
+    python main.py --metrics-socket /tmp/golden-hound.sock
+                                              # curl --unix-socket /tmp/golden-hound.sock http://x/metrics
+
+Both bind locally only. On a UNIX socket the snapshot is written as a plain
+HTTP response too, so the same client works for both.
+
+Measured with `python metrics.py` (a scripted 1800-frame swimming run, one
+core): a snapshot takes ~0.05 ms to collect and ~0.35 ms with its JSON
+encoding, twice a second. With a client scraping ~85 times a second, frame
+work time goes from ~2.6 ms to ~2.8-3.1 ms, the CPU time the server thread
+takes on this single core; a scrape takes ~0.9 ms, up to ~5.5 ms when it
+waits for the game loop to release the interpreter, never the other way round.
+"""
+import http.server
+import json
+import os
+import socketserver
+import threading
+import time
+from collections import deque
+import pygame
+import display
+
+
+def surface_bytes(surface):
+    """Pixel bytes held by a surface."""
+    return surface.get_pitch() * surface.get_height()
+
+
+def sprite_groups(owner):
+    """Sprites in each sprite group attribute of an object: attribute name -> count."""
+    return {name: len(value) for name, value in vars(owner).items()
+            if isinstance(value, pygame.sprite.AbstractGroup)}
+
+
+def asset_surfaces(asset_manager):
+    """Surfaces an AssetManager holds, by id, each counted once."""
+    surfaces = {}
+    for cache in (asset_manager.images, asset_manager.sprites, asset_manager.derived):
+        for surface in cache.values():
+            surfaces[id(surface)] = surface
+    for surface in list(asset_manager.render_images.values()):
+        surfaces[id(surface)] = surface
+    return surfaces
+
+
+def asset_metrics(asset_manager):
+    """
+    Cache sizes of an AssetManager and the bytes of the surfaces it holds.
+
+    A surface cached under several keys (an opaque image is its own sprite) is
+    counted once.
+    """
+    surfaces = asset_surfaces(asset_manager)
+    return {
+        'images': len(asset_manager.images),
+        'sprites': len(asset_manager.sprites),
+        'derived': len(asset_manager.derived),
+        'render_images': len(asset_manager.render_images),
+        'sounds': len(asset_manager.sounds),
+        'surface_bytes': sum(surface_bytes(surface) for surface in surfaces.values()
+                             if isinstance(surface, pygame.Surface)),
+    }
+
+
+def image_store_metrics(scene, asset_manager):
+    """
+    PNG bytes kept by the image store and the decoded images the current
+    scene holds outside the AssetManager (e.g. the intro frames).
+    """
+    import image_store
+    store = image_store.get()
+    counted = asset_surfaces(asset_manager)
+    held = [surface for surface in scene.held_surfaces() if id(surface) not in counted]
+    return {
+        'compressed': len(store.compressed),
+        'compressed_bytes': store.compressed_bytes(),
+        'scene_held': len(held),
+        'scene_held_bytes': sum(surface_bytes(surface) for surface in held),
+    }
+
+
+def mixer_metrics():
+    """Busy mixer channels, in total and per reserved sound category."""
+    import audio
+    if pygame.mixer.get_init() is None:
+        return {'channels': 0, 'busy': 0}
+    manager = audio.get()
+    channels = pygame.mixer.get_num_channels()
+    return {
+        'channels': channels,
+        'busy': sum(pygame.mixer.Channel(i).get_busy() for i in range(channels)),
+        'music_busy': sum(channel.get_busy() for channel in getattr(manager, 'music_channels', ())),
+        'categories': {name: sum(channel.get_busy() for channel in category['channels'])
+                       for name, category in manager.categories.items()},
+        'dropped_sounds': manager.dropped,
+        'decoded_tracks': len(manager.tracks),
+    }
+
+
+class _HTTPHandler(http.server.BaseHTTPRequestHandler):
+    """Answers GET /metrics (and /) with the latest snapshot."""
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        payload = self.server.metrics.payload
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _UnixHandler(socketserver.StreamRequestHandler):
+    """Writes the latest snapshot as an HTTP response to every connection."""
+    def handle(self):
+        self.rfile.readline()  # Request line, if the client sends one
+        payload = self.server.metrics.payload
+        self.wfile.write(b"HTTP/1.0 200 OK\r\nContent-Type: application/json\r\n"
+                         + f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload)
+
+
+class MetricsServer:
+    """Collects metrics snapshots on the game loop and serves them from a background thread."""
+    def __init__(self, port=None, socket_path=None, interval=0.5, window=600):
+        """
+        Args:
+            port (int): Local HTTP port to serve on
+            socket_path (str): UNIX socket path to serve on, instead of a port
+            interval (float): Seconds between snapshots
+            window (int): Recent frames the frame-time percentiles are taken over
+        """
+        self.interval = interval
+        self.frame_times = deque(maxlen=window)
+        self.frames = 0
+        self.started = time.perf_counter()
+        self.next_snapshot = 0.0
+        self.snapshots = 0
+        self.collect_ms = 0.0  # Time spent building the last snapshot
+
+        # Published snapshot; replaced whole, never modified, so readers need no lock
+        self.payload = b"{}"
+
+        self.socket_path = socket_path
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            self.server = socketserver.UnixStreamServer(socket_path, _UnixHandler)
+        else:
+            self.server = http.server.HTTPServer(("127.0.0.1", port or 0), _HTTPHandler)
+        self.server.metrics = self
+        self.address = socket_path or f"http://127.0.0.1:{self.server.server_address[1]}/metrics"
+        self.thread = threading.Thread(target=self.server.serve_forever, name="metrics-server", daemon=True)
+        self.thread.start()
+
+    def end_frame(self, frame_ms, scenes, asset_manager, fields=None):
+        """
+        Record a frame's work time and publish a new snapshot when one is due.
+
+        Args:
+            frame_ms (float): Work time of the frame
+            scenes (SceneManager): Scene manager, for the current scene and its sprite groups
+            asset_manager (AssetManager): Shared asset cache
+            fields (dict): Extra values to include, e.g. the profiler overlay's fields
+
+        Returns:
+            bool: True if a snapshot was published
+        """
+        self.frame_times.append(frame_ms)
+        self.frames += 1
+        now = time.perf_counter()
+        if now < self.next_snapshot:
+            return False
+        self.next_snapshot = now + self.interval
+        self.publish(self.collect(scenes, asset_manager, fields))
+        self.collect_ms = (time.perf_counter() - now) * 1000
+        return True
+
+    def collect(self, scenes, asset_manager, fields=None):
+        """Build a snapshot of the game's current state as a dict."""
+        ordered = sorted(self.frame_times)
+        percentile = lambda fraction: ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+        scene = scenes.scene
+        # The swimming scene keeps its sprite groups on its game
+        owner = getattr(scene, 'game', None) or scene
+        # The window surface and the internal render surface, when they differ;
+        # with a renderer backend the window surface is a hidden 1x1 one and the
+        # target a TextureScreen, so the internal surface is asked for directly
+        renders = {id(surface): surface for surface in
+                   (pygame.display.get_surface(), display.get_surface(), display.get_target())
+                   if isinstance(surface, pygame.Surface)}
+        return {
+            'time': time.time(),
+            'uptime': time.perf_counter() - self.started,
+            'frames': self.frames,
+            'frame_ms': {
+                'window': len(ordered),
+                'mean': sum(ordered) / len(ordered) if ordered else 0.0,
+                'p50': percentile(0.5),
+                'p95': percentile(0.95),
+                'p99': percentile(0.99),
+                'max': ordered[-1] if ordered else 0.0,
+            },
+            'scene': scenes.name,
+            'sprite_groups': sprite_groups(owner),
+            'assets': asset_metrics(asset_manager),
+            'image_store': image_store_metrics(scene, asset_manager),
+            'render_surface_bytes': sum(surface_bytes(surface) for surface in renders.values()),
+            'mixer': mixer_metrics(),
+            'fields': {name: str(value) for name, value in (fields or {}).items()},
+            'collect_ms': self.collect_ms,
+        }
+
+    def publish(self, snapshot):
+        """Encode a snapshot and make it the one served."""
+        self.payload = json.dumps(snapshot).encode()
+        self.snapshots += 1
+
+    def close(self):
+        """Stop serving and remove the socket file."""
+        self.server.shutdown()
+        self.server.server_close()
+        if self.socket_path and os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+if __name__ == "__main__":
+    # Cost of collecting snapshots, and frame time with a client scraping as fast as it can
+    import random
+    import urllib.request
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    pygame.mixer.init()
+    from scenes import SceneManager, build_scenes
+    from sweep import RandomPolicy
+    from utils import AssetManager
+
+    display.init()
+    random.seed(1)
+    asset_manager = AssetManager()
+    scenes = SceneManager(build_scenes(), asset_manager, "swimming")
+    game = scenes.scene.game
+    policy = RandomPolicy(random.Random(1))
+    game.player.input_source = lambda: policy(game)
+
+    def run(frames, metrics=None):
+        times = []
+        for _ in range(frames):
+            start = time.perf_counter()
+            if not game._update_game_state():
+                game._restart_game()
+            game._draw()
+            frame_ms = (time.perf_counter() - start) * 1000
+            times.append(frame_ms)
+            if metrics:
+                metrics.end_frame(frame_ms, scenes, asset_manager)
+        return sum(times) / len(times)
+
+    run(300)
+    plain_ms = run(1800)
+
+    metrics = MetricsServer()
+    collects = []
+    for _ in range(200):
+        start = time.perf_counter()
+        metrics.collect(scenes, asset_manager)
+        collects.append((time.perf_counter() - start) * 1000)
+
+    scrapes = []
+    scraping = True
+
+    def scrape():
+        while scraping:
+            start = time.perf_counter()
+            with urllib.request.urlopen(metrics.address) as response:
+                json.loads(response.read())
+            scrapes.append((time.perf_counter() - start) * 1000)
+            time.sleep(0.01)
+
+    client = threading.Thread(target=scrape, daemon=True)
+    client.start()
+    scraped_ms = run(1800, metrics)
+    scraping = False
+    client.join()
+
+    with urllib.request.urlopen(metrics.address) as response:
+        print(json.dumps(json.loads(response.read()), indent=2))
+    metrics.close()
+    game.player.stop_sound()
+    collects.sort()
+    scrapes.sort()
+    print(f"snapshot {collects[len(collects) // 2]:.3f} ms (p95 {collects[int(len(collects) * 0.95)]:.3f} ms), "
+          f"{metrics.snapshots} published")
+    print(f"frame {plain_ms:.2f} ms without the server, {scraped_ms:.2f} ms with {len(scrapes)} scrapes "
+          f"of {scrapes[len(scrapes) // 2]:.2f} ms (p95 {scrapes[int(len(scrapes) * 0.95)]:.2f} ms)")
+    pygame.quit()
@@ -1,21 +1,19 @@
 import pygame
 import random
+import animation
+from animation import AnimationClip
 
 class Miner(pygame.sprite.Sprite):
     """Represents an enemy Miner that moves from right to left."""
     def __init__(self, asset_manager, screen_width, screen_height):
         super().__init__()
         
-        # Load animation frames
-        self.animation_frames = [
-            asset_manager.load_image('assets/images/miner1.png'),
-            asset_manager.load_image('assets/images/miner2.png')
-        ]
-        
-        # Animation management
-        self.current_frame = 0
-        self.animation_timer = 0
-        self.animation_speed = 10  # Controls animation speed
+        # Animation shared by every miner; animation.animate() shows the frame of the current tick
+        self.clip = AnimationClip.shared([
+            asset_manager.load_sprite('assets/images/miner1.png'),
+            asset_manager.load_sprite('assets/images/miner2.png')
+        ], 10)
+        self.phase = animation.ticks
         
         # Spawn at a random vertical position on the right side of the screen
         self.screen_width = screen_width
@@ -23,7 +21,7 @@ class Miner(pygame.sprite.Sprite):
         spawn_y = random.randint(0, screen_height - 300)  # Adjust 100 based on miner sprite height
         
         # Initial setup
-        self.image = self.animation_frames[0]
+        self.image = self.clip.frames[0]
         self.rect = self.image.get_rect(topleft=(screen_width, spawn_y))
         
         # Movement attributes
@@ -34,19 +32,12 @@ class Miner(pygame.sprite.Sprite):
 
     def update(self):
         """
-        Update miner's position and animation.
+        Update miner's position.
         Moves from right to left.
         """
         # Move left
         self.rect.x -= self.speed
         
-        # Animate
-        self.animation_timer += 1
-        if self.animation_timer >= self.animation_speed:
-            self.animation_timer = 0
-            self.current_frame = (self.current_frame + 1) % len(self.animation_frames)
-            self.image = self.animation_frames[self.current_frame]
-        
         # Remove if off screen
         if self.rect.right < 0:
             self.kill()
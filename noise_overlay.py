@@ -0,0 +1,197 @@
+"""
+Animated Perlin noise overlay drawn over the swimming and intro scenes.
+
+numpy and noise are only imported with this module, when the first scene
+that draws an overlay is entered.
+"""
+import weakref
+import noise
+import numpy as np
+import pygame
+import compositor
+import surface_cache
+
+# Noise frames before the overlay animation loops (10 s at 60 fps)
+RING_FRAMES = 600
+
+# Rings shared by overlays drawing the same noise: (width, height, extent) -> NoiseRing
+_noise_rings = weakref.WeakValueDictionary()
+
+
+def noise_ring(width, height, extent):
+    """Return the shared NoiseRing of a noise grid, creating it on first use."""
+    ring = _noise_rings.get((width, height, extent))
+    if ring is None:
+        ring = _noise_rings[(width, height, extent)] = NoiseRing(width, height, extent)
+    return ring
+
+
+class NoiseRing:
+    """
+    Looping sequence of Perlin noise frames, kept in the disk cache.
+
+    The noise repeats along its time axis after `frames` frames, so frame t
+    and frame t + frames are identical and each frame only ever has to be
+    computed once. Frames are computed when first shown; close() stores the
+    computed ones, and later launches read them back memory-mapped.
+    """
+    def __init__(self, width, height, extent, frames=RING_FRAMES, speed=0.1, octaves=3):
+        """
+        Args:
+            width (int): Noise grid width
+            height (int): Noise grid height
+            extent (tuple): Noise space covered by the grid, (x, y)
+            frames (int): Frames in the loop
+            speed (float): Noise space travelled along the time axis per frame
+            octaves (int): Perlin noise octaves
+        """
+        self.extent = extent
+        self.speed = speed
+        self.octaves = octaves
+        # The noise repeats along z after this many units
+        self.repeat = round(frames * speed)
+        params = {'size': (width, height), 'extent': extent, 'frames': frames, 'speed': speed, 'octaves': octaves}
+        self.key = surface_cache.key('noise_ring', (), params)
+        self.filled_key = surface_cache.key('noise_ring_filled', (), params)
+
+        cache = surface_cache.get()
+        self.frames = cache.load_array(self.key, mmap_mode='c')
+        self.filled = cache.load_array(self.filled_key, mmap_mode=None)
+        if self.frames is None or self.filled is None or self.frames.shape != (frames, height, width):
+            self.frames = np.zeros((frames, height, width), np.uint8)
+            self.filled = np.zeros(frames, bool)
+        self.computed = 0  # Frames computed since the last store
+
+    def frame(self, time):
+        """Return the noise of a frame as a (height, width) uint8 array."""
+        index = time % len(self.frames)
+        if not self.filled[index]:
+            height, width = self.frames.shape[1:]
+            x_vals, y_vals = np.meshgrid(
+                np.linspace(0, self.extent[0], width),
+                np.linspace(0, self.extent[1], height)
+            )
+            z = index * self.speed
+            noise_array = np.vectorize(lambda x, y: noise.pnoise3(
+                x, y, z, octaves=self.octaves, repeatz=self.repeat))(x_vals, y_vals)
+            self.frames[index] = ((noise_array + 1) * 127.5).astype(np.uint8)  # Normalize to 0-255
+            self.filled[index] = True
+            self.computed += 1
+        return self.frames[index]
+
+    def close(self):
+        """Store newly computed frames in the disk cache."""
+        if self.computed:
+            cache = surface_cache.get()
+            cache.store_array(self.key, self.frames)
+            cache.store_array(self.filled_key, self.filled)
+            self.computed = 0
+
+
+class PerlinNoiseOverlay:
+    def __init__(self, width, height, noise_width=25, noise_height=100, scale=0.05, alpha=60):
+        self.width = width
+        self.height = height
+        self.noise_width = noise_width
+        self.noise_height = noise_height
+        self.scale = scale
+        self.alpha = alpha
+        self.time = 0
+
+        # Quality settings: fraction of the noise resolution and frames between regenerations
+        self.resolution = 1.0
+        self.update_interval = 1
+
+        # Last generated noise frame (as an array and a surface) and its upscaled
+        # overlay, reused until the frame is due for regeneration
+        self.noise = None
+        self.frame = None
+        self.surface = None
+        self.generated_time = None
+        self.upscaled_time = None
+
+        # Noise frames per resolution
+        self.rings = {}
+
+    def set_quality(self, resolution=1.0, update_interval=1):
+        """
+        Adjust overlay cost.
+
+        Args:
+            resolution (float): Fraction of the full noise texture resolution
+            update_interval (int): Regenerate the noise every N updates
+        """
+        if resolution != self.resolution:
+            self.frame = None
+        self.resolution = resolution
+        self.update_interval = max(1, int(update_interval))
+    
+    def generate(self, upscale=True):
+        """
+        Generates a Perlin noise texture.
+
+        Args:
+            upscale (bool): Return it at the overlay size, False for the noise resolution
+
+        Returns:
+            pygame.Surface: Noise with the overlay's surface alpha
+        """
+        if self.frame is None or self.time - self.generated_time >= self.update_interval:
+            self.frame = self._generate_frame()
+            self.generated_time = self.time
+        if not upscale:
+            return self.frame
+        # Upscale into the same full-size surface each time; a new one per frame
+        # costs ~8x more, mostly in fresh pages and the conversion
+        if self.surface is None or self.upscaled_time != self.generated_time:
+            frame = self.frame.convert_alpha()
+            if self.surface is None:
+                self.surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA, frame)
+            pygame.transform.scale(frame, (self.width, self.height), self.surface)
+            self.surface.set_alpha(self.alpha)
+            self.upscaled_time = self.generated_time
+        return self.surface
+
+    def draw(self, target):
+        """
+        Blend the current noise over a target.
+
+        Targets that scale while copying (texture_screen.TextureScreen) stretch
+        the noise-resolution frame themselves, skipping the upscale and the
+        upload of a full-size surface. On surfaces the overlay's size, the
+        compositor, when configured with several threads, stretches and blends
+        the noise in bands.
+        """
+        blit_scaled = getattr(target, "blit_scaled", None)
+        if blit_scaled is not None:
+            blit_scaled(self.generate(upscale=False), (0, 0, self.width, self.height))
+            return
+        self.generate(upscale=False)
+        if target.get_size() != (self.width, self.height) or \
+                not compositor.get().blend_gray_scaled(target, self.noise, self.alpha):
+            target.blit(self.generate(), (0, 0))
+
+    def _generate_frame(self):
+        """The noise frame at the current time and resolution."""
+        noise_width = max(1, int(self.noise_width * self.resolution))
+        noise_height = max(1, int(self.noise_height * self.resolution))
+        ring = self.rings.get(self.resolution)
+        if ring is None:
+            extent = (self.noise_width * self.scale, self.noise_height * self.scale)
+            ring = self.rings[self.resolution] = noise_ring(noise_width, noise_height, extent)
+        noise_array = self.noise = ring.frame(self.time)
+
+        surface = pygame.Surface((noise_width, noise_height))
+        noise_rgb = np.stack([noise_array.T] * 3, axis=-1)  # Convert grayscale to RGB
+        pygame.surfarray.blit_array(surface, noise_rgb)
+        
+        surface.set_alpha(self.alpha)  # Adjust transparency
+        return surface
+    
+    def update(self):
+        self.time += 1  # Increment time for animation
+
+    def close(self):
+        """Store the noise frames computed so far in the disk cache."""
+        for ring in self.rings.values():
+            ring.close()
@@ -0,0 +1,138 @@
+import pygame
+import numpy as np
+
+class ScreenObserver:
+    """
+    Exposes rendered frames of the game screen as NumPy arrays.
+
+    view() returns a `pixels3d` view straight into the display surface, so a
+    native-resolution observation read that way costs nothing beyond the
+    render itself. capture() stores frames in a preallocated frame stack, so
+    nothing is allocated per frame: downscaled observations are rendered into
+    a preallocated offscreen surface first, native ones are copied from the
+    whole screen, which is what makes them expensive.
+
+    Measured costs per frame (1280x720 screen, SDL dummy driver, one core):
+        native view()          0 bytes     ~0.002 ms
+        native RGB capture()   2.7 MB      ~5.6-7.1 ms
+        160x90 RGB             43 KB       ~0.08-0.13 ms
+        160x90 gray            14 KB       ~0.02-0.03 ms
+        320x180 RGB            173 KB      ~0.35-0.50 ms
+        84x84 gray x4 stack    7 KB        ~0.02 ms
+
+    Memory is per stacked frame; the offscreen target adds one more frame of
+    the display format (4 bytes per pixel). Use view() rather than capture()
+    for native frames that need not outlive the next draw.
+    """
+    def __init__(self, screen, size=None, grayscale=False, stack=1):
+        """
+        Args:
+            screen (pygame.Surface): Surface the game renders to
+            size (tuple): Observation (width, height), or None for native
+            grayscale (bool): Store a single luminance channel instead of RGB
+            stack (int): Number of most recent frames kept
+        """
+        self.screen = screen
+        self.size = tuple(size) if size else None
+        self.grayscale = grayscale
+        self.stack = max(1, stack)
+
+        width, height = self.size or screen.get_size()
+        shape = (self.stack, height, width) if grayscale else (self.stack, height, width, 3)
+        self.frames = np.zeros(shape, dtype=np.uint8)
+        self.frame_index = -1
+
+        # Offscreen render target in the display format
+        self.target = None
+        if self.size or grayscale:
+            self.target = pygame.Surface((width, height), 0, screen)
+
+    @property
+    def bytes_per_frame(self):
+        """Bytes used by one stored observation frame."""
+        return self.frames[0].nbytes
+
+    def view(self):
+        """
+        Return a zero-copy (height, width, 3) view of the display surface.
+
+        The view locks the screen; drop the reference before the next blit or flip.
+        """
+        return pygame.surfarray.pixels3d(self.screen).transpose(1, 0, 2)
+
+    def capture(self):
+        """Store the current screen contents as the newest stacked frame."""
+        self.frame_index = (self.frame_index + 1) % self.stack
+        slot = self.frames[self.frame_index]
+
+        if self.target is None:
+            pixels = pygame.surfarray.pixels3d(self.screen)
+            np.copyto(slot, pixels.transpose(1, 0, 2))
+            del pixels
+            return slot
+
+        if self.size:
+            pygame.transform.scale(self.screen, self.size, self.target)
+            source = self.target
+        else:
+            source = self.screen
+
+        if self.grayscale:
+            pygame.transform.grayscale(source, self.target)
+            pixels = pygame.surfarray.pixels_red(self.target)
+            np.copyto(slot, pixels.T)
+        else:
+            pixels = pygame.surfarray.pixels3d(self.target)
+            np.copyto(slot, pixels.transpose(1, 0, 2))
+        del pixels
+        return slot
+
+    def observation(self):
+        """
+        Return the stacked frames ordered from oldest to newest.
+
+        With a stack of one this is the newest frame itself, without a copy.
+        """
+        if self.stack == 1:
+            return self.frames[0]
+        order = (np.arange(1, self.stack + 1) + self.frame_index) % self.stack
+        return self.frames[order]
+
+    def reset(self):
+        """Clear the frame stack."""
+        self.frames.fill(0)
+        self.frame_index = -1
+
+
+if __name__ == "__main__":
+    # Benchmark observation costs against a running game
+    import os
+    import time
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    from swimming_game import SwimmingGame
+
+    game = SwimmingGame()
+    configs = [
+        ("native view()", None, False, 1),
+        ("native RGB capture()", None, False, 1),
+        ("160x90 RGB", (160, 90), False, 1),
+        ("160x90 gray", (160, 90), True, 1),
+        ("320x180 RGB", (320, 180), False, 1),
+        ("84x84 gray x4 stack", (84, 84), True, 4),
+    ]
+    for name, size, grayscale, stack in configs:
+        observer = ScreenObserver(game.screen, size, grayscale, stack)
+        game._draw()
+        start = time.perf_counter()
+        for _ in range(200):
+            if name == "native view()":
+                frame = observer.view()
+                del frame
+            else:
+                observer.capture()
+        elapsed = (time.perf_counter() - start) / 200 * 1000
+        frame_bytes = 0 if name == "native view()" else observer.bytes_per_frame
+        print(f"{name:22s} {frame_bytes:8d} bytes/frame {elapsed:7.3f} ms/frame")
+    pygame.quit()
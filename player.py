@@ -1,5 +1,21 @@
 import pygame
 import math
+import audio
+import tracing
+import animation
+from animation import AnimationClip, REVERSE
+
+# Movement keys (WASD and arrows) and their directions, built once instead of per input
+MOVEMENT_KEYS = (
+    (pygame.K_w, 0, -1),
+    (pygame.K_s, 0, 1),
+    (pygame.K_a, -1, 0),
+    (pygame.K_d, 1, 0),
+    (pygame.K_UP, 0, -1),
+    (pygame.K_DOWN, 0, 1),
+    (pygame.K_LEFT, -1, 0),
+    (pygame.K_RIGHT, 1, 0),
+)
 
 class Player(pygame.sprite.Sprite):
     """Represents the player character in the game."""
@@ -14,12 +30,8 @@ class Player(pygame.sprite.Sprite):
         self.current_level = current_level
         
         # Load animation frames based on current level
-        self._load_player_assets(asset_manager)
-        
-        # Animation and state management
-        self.current_frame = 0
-        self.animation_timer = 0
         self.animation_speed = 5
+        self._load_player_assets(asset_manager)
         
         # Direction tracking (1 for right, -1 for left)
         self.facing_right = True
@@ -34,7 +46,9 @@ class Player(pygame.sprite.Sprite):
         self.bob_amplitude = 5
         self.bob_frequency = 3
         
-        # Player setup
+        # Player setup; animation.animate() shows the frames of the clip chosen by animate()
+        self.clip = self.idle_clip
+        self.phase = animation.ticks
         self.image = self.animation_frames[0]
         self.rect = self.image.get_rect(topleft=(x, y))
         self.original_y = y
@@ -49,16 +63,25 @@ class Player(pygame.sprite.Sprite):
         # Score
         self.score = 0
 
+        # Source of pressed key states; replaced by scripted policies in headless runs
+        self.input_source = pygame.key.get_pressed
+
     def _load_player_assets(self, asset_manager):
         """Load player assets based on current level."""
         # Load animation frames for current level
         self.animation_frames = [
-            asset_manager.load_image(f'assets/images/player/player{self.current_level}_{i}.png') 
+            asset_manager.load_sprite(f'assets/images/player/player{self.current_level}_{i}.png') 
             for i in range(1, 8)
         ]
         
         # Load special state images
-        self.eating_image = asset_manager.load_image(f"assets/images/player/player{self.current_level}_eat.png")
+        self.eating_image = asset_manager.load_sprite(f"assets/images/player/player{self.current_level}_eat.png")
+
+        # Clips of each state: swimming frames play backwards when moving left
+        self.swim_clip = AnimationClip.shared(self.animation_frames, self.animation_speed)
+        self.swim_back_clip = AnimationClip.shared(self.animation_frames, self.animation_speed, REVERSE)
+        self.idle_clip = AnimationClip.shared(self.animation_frames[:1], self.animation_speed)
+        self.eating_clip = AnimationClip.shared([self.eating_image], self.animation_speed)
         
         # Load sounds (these don't change with level)
         self.eat_sound = asset_manager.load_sound("assets/sounds/CLICK.ogg", 0.2)
@@ -67,10 +90,11 @@ class Player(pygame.sprite.Sprite):
     def set_level(self, asset_manager, level):
         """Update player assets when level changes."""
         self.current_level = level
-        print("NEXT!!")
+        tracing.get().emit('level_up', value=level)
         self._load_player_assets(asset_manager)
         # Reset to first frame
-        self.current_frame = 0
+        self.clip = self.idle_clip
+        self.phase = animation.ticks
         self.image = self.animation_frames[0]
 
     def handle_input(self, rocks):
@@ -80,7 +104,7 @@ class Player(pygame.sprite.Sprite):
         Args:
             rocks (pygame.sprite.Group): Group of rock sprites
         """
-        keys = pygame.key.get_pressed()
+        keys = self.input_source()
         
         # Reset velocities
         self.velocity_x = 0
@@ -88,27 +112,18 @@ class Player(pygame.sprite.Sprite):
         self.is_moving = False
         
         # WASD Movement with collision detection and rock pushback
-        movement_map = {
-            pygame.K_w: (0, -self.speed),
-            pygame.K_s: (0, self.speed),
-            pygame.K_a: (-self.speed, 0),
-            pygame.K_d: (self.speed, 0),
-            pygame.K_UP: (0, -self.speed),
-            pygame.K_DOWN: (0, self.speed),
-            pygame.K_LEFT: (-self.speed, 0),
-            pygame.K_RIGHT: (self.speed, 0)
-        }
-        
         # Player's desired movement
         player_dx, player_dy = 0, 0
         
-        # Track which keys are pressed
-        pressed_keys = [key for key, (dx, dy) in movement_map.items() if keys[key]]
+        # Count the pressed movement keys
+        pressed_keys = 0
         
-        for key, (dx, dy) in movement_map.items():
+        for key, direction_x, direction_y in MOVEMENT_KEYS:
             if keys[key]:
+                dx = direction_x * self.speed
                 player_dx += dx
-                player_dy += dy
+                player_dy += direction_y * self.speed
+                pressed_keys += 1
                 self.is_moving = True
                 
                 # Update facing direction based on horizontal movement
@@ -118,7 +133,7 @@ class Player(pygame.sprite.Sprite):
                     self.facing_right = False
         
         # Normalize diagonal movement speed
-        if len(pressed_keys) == 2:  # Diagonal movement
+        if pressed_keys == 2:  # Diagonal movement
             player_dx *= 0.707  # 1/sqrt(2)
             player_dy *= 0.707  # 1/sqrt(2)
         
@@ -191,41 +206,34 @@ class Player(pygame.sprite.Sprite):
         
 
     def stop_sound(self):
-        self.move_sound.stop()
+        audio.get().stop(self.move_sound)
+        self.sound_playing = False
 
     def _manage_movement_sound(self):
-        """Manage swimming sound based on movement state."""
-        if self.is_moving:
-            if not self.sound_playing:
-                self.move_sound.play(-1, fade_ms=200)
-                self.sound_playing = True
-        else:
-            self.move_sound.fadeout(200)
+        """Start or fade the swimming sound when the movement state changes."""
+        if self.is_moving and not self.sound_playing:
+            audio.get().play(self.move_sound, 'loops', loops=-1, fade_ms=200)
+            self.sound_playing = True
+        elif not self.is_moving and self.sound_playing:
+            audio.get().stop(self.move_sound, fade_ms=200)
             self.sound_playing = False
 
     def animate(self):
-        """Handle player animation."""
+        """Choose the clip of the player's state, restarting it when the state changes."""
         if self.is_eating:
-            self.image = self.eating_image
-            return 
-        
-        self.animation_timer += 1
-        
-        if self.animation_timer >= self.animation_speed:
-            self.animation_timer = 0
-            
-            if self.is_moving:
-                if self.facing_right:
-                    # Normal animation order when moving right
-                    self.current_frame = (self.current_frame + 1) % len(self.animation_frames)
-                else:
-                    # Reverse animation order when moving left
-                    self.current_frame = (self.current_frame - 1) % len(self.animation_frames)
-            else:
-                # Reset to first frame when not moving
-                self.current_frame = 0
-                
-            self.image = self.animation_frames[self.current_frame]
+            clip = self.eating_clip
+        elif not self.is_moving:
+            # First frame when not moving
+            clip = self.idle_clip
+        elif self.facing_right:
+            clip = self.swim_clip
+        else:
+            # Reverse animation order when moving left
+            clip = self.swim_back_clip
+
+        if clip is not self.clip:
+            self.clip = clip
+            self.phase = animation.ticks
 
     def swimming_bob(self):
         """Create a swimming bob effect."""
@@ -0,0 +1,83 @@
+import pygame
+import time
+from collections import deque
+from text import TextLabel
+
+class FrameProfiler:
+    """Tracks per-frame work time and draws an on-screen profiler overlay."""
+    def __init__(self, window=120):
+        """
+        Args:
+            window (int): Number of recent frames kept for statistics
+        """
+        self.frame_times = deque(maxlen=window)
+        self.frame_start = None
+        self.frame_count = 0
+
+        # Extra values shown in the overlay, e.g. the current quality level
+        self.fields = {}
+
+        # Overlay is toggled with F3
+        self.visible = False
+        self.font = None
+        self.labels = []  # One cached TextLabel per overlay line
+
+    def begin_frame(self):
+        """Mark the start of a frame's work."""
+        self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """
+        Mark the end of a frame's work.
+
+        Returns:
+            float: Work time of the frame in milliseconds
+        """
+        if self.frame_start is None:
+            return 0.0
+        frame_ms = (time.perf_counter() - self.frame_start) * 1000
+        self.frame_times.append(frame_ms)
+        self.frame_start = None
+        self.frame_count += 1
+        return frame_ms
+
+    def average(self):
+        """Mean frame work time over the window in milliseconds."""
+        if not self.frame_times:
+            return 0.0
+        return sum(self.frame_times) / len(self.frame_times)
+
+    def percentile(self, fraction):
+        """Frame work time at the given percentile (0-1) in milliseconds."""
+        if not self.frame_times:
+            return 0.0
+        ordered = sorted(self.frame_times)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def toggle(self):
+        """Show or hide the overlay."""
+        self.visible = not self.visible
+
+    def draw(self, surface):
+        """Draw the overlay in the top right corner of the surface."""
+        if not self.visible:
+            return
+        if self.font is None:
+            self.font = pygame.font.Font(None, 24)
+
+        lines = [
+            f"frame {self.average():5.1f} ms",
+            f"p95   {self.percentile(0.95):5.1f} ms",
+        ]
+        lines += [f"{name} {value}" for name, value in self.fields.items()]
+
+        while len(self.labels) < len(lines):
+            self.labels.append(TextLabel(self.font, (255, 255, 0)))
+
+        x = surface.get_width() - 180
+        y = 10
+        for label, line in zip(self.labels, lines):
+            text = label.set_text(line)
+            surface.fill((0, 0, 0), (x, y, *label.size))
+            surface.blit(text, (x, y))
+            y += label.size[1] + 2
@@ -0,0 +1,114 @@
+from collections import deque
+
+# Quality presets from cheapest to best
+QUALITY_LEVELS = [
+    {
+        'name': 'low',
+        'noise_resolution': 0.5,    # Fraction of the noise texture resolution
+        'noise_update_interval': 4,  # Regenerate the noise every N frames
+        'glitter_cap': 8,            # Maximum glitter particles on the progress bar
+        'bird_rotation_step': 15,    # Bird rotation quantized to this many degrees
+        'hud_shadows': False,
+    },
+    {
+        'name': 'medium',
+        'noise_resolution': 1.0,
+        'noise_update_interval': 2,
+        'glitter_cap': 20,
+        'bird_rotation_step': 5,
+        'hud_shadows': True,
+    },
+    {
+        'name': 'high',
+        'noise_resolution': 1.0,
+        'noise_update_interval': 1,
+        'glitter_cap': 60,
+        'bird_rotation_step': 1,
+        'hud_shadows': True,
+    },
+]
+
+
+class QualityGovernor:
+    """
+    Steps rendering quality down and up to hold a frame-time budget.
+
+    Frame times are collected over a rolling window. Quality drops one level
+    when the window average exceeds the budget by `downgrade_ratio` and rises
+    one level when it falls below `upgrade_ratio` of the budget. After each
+    change the window is cleared and the governor waits `cooldown` frames, so
+    it does not oscillate between two levels.
+    """
+    def __init__(self, budget_ms=1000 / 60, window=60, downgrade_ratio=1.1,
+                 upgrade_ratio=0.7, cooldown=180, level=None):
+        """
+        Args:
+            budget_ms (float): Target frame work time in milliseconds
+            window (int): Number of frames averaged before deciding
+            downgrade_ratio (float): Budget multiple that triggers a downgrade
+            upgrade_ratio (float): Budget multiple that allows an upgrade
+            cooldown (int): Frames to wait after a level change
+            level (int): Starting level index, defaults to the best quality
+        """
+        self.budget_ms = budget_ms
+        self.frame_times = deque(maxlen=window)
+        self.downgrade_ratio = downgrade_ratio
+        self.upgrade_ratio = upgrade_ratio
+        self.cooldown = cooldown
+        self.cooldown_timer = 0
+        self.level = len(QUALITY_LEVELS) - 1 if level is None else level
+
+    @property
+    def settings(self):
+        """Settings of the current quality level."""
+        return QUALITY_LEVELS[self.level]
+
+    @property
+    def level_name(self):
+        return self.settings['name']
+
+    def record(self, frame_ms):
+        """
+        Record a frame's work time and adjust the level if needed.
+
+        Args:
+            frame_ms (float): Work time of the frame in milliseconds
+
+        Returns:
+            bool: True if the quality level changed
+        """
+        if self.cooldown_timer > 0:
+            self.cooldown_timer -= 1
+            return False
+
+        self.frame_times.append(frame_ms)
+        if len(self.frame_times) < self.frame_times.maxlen:
+            return False
+
+        average = sum(self.frame_times) / len(self.frame_times)
+        if average > self.budget_ms * self.downgrade_ratio and self.level > 0:
+            self.level -= 1
+        elif average < self.budget_ms * self.upgrade_ratio and self.level < len(QUALITY_LEVELS) - 1:
+            self.level += 1
+        else:
+            return False
+
+        self.frame_times.clear()
+        self.cooldown_timer = self.cooldown
+        return True
+
+    def apply(self, game, overlays=()):
+        """
+        Apply the current level to a game and any extra noise overlays.
+
+        Args:
+            game (SwimmingGame): Game whose effects are adjusted
+            overlays (iterable): Additional PerlinNoiseOverlay instances
+        """
+        settings = self.settings
+        for overlay in (game.noise_overlay, *overlays):
+            overlay.set_quality(settings['noise_resolution'], settings['noise_update_interval'])
+        game.glitter_cap = settings['glitter_cap']
+        game.hud_shadows = settings['hud_shadows']
+        from bird import Bird  # Imported with the swimming scene, not at startup
+        Bird.rotation_step = settings['bird_rotation_step']
@@ -0,0 +1,136 @@
+"""
+Per-frame render queue flushed with one batched blit call per layer.
+
+Subsystems add (surface, dest) pairs to named layers while a frame is drawn
+instead of calling Surface.blit for each one; flush() then submits every
+layer in order with a single Surface.fblits call (or Surface.blits with
+doreturn=False when a layer mixes areas or blend flags), so the per-draw
+cost is a list append instead of a Python-level blit call that also builds
+and returns a Rect. A layer's blit() has the signature of Surface.blit, so
+code written against a surface (TextLabel.draw) can draw into it unchanged.
+
+Measured with `python render_queue.py` (SDL dummy driver, 1280x720, 10x10
+alpha sprites, one core):
+    draws    Surface.blit each    queued, one fblits    queued with areas, one blits
+    50       ~0.035 ms            ~0.02 ms              ~0.04-0.05 ms
+    500      ~0.33-0.38 ms        ~0.21-0.29 ms         ~0.44-0.56 ms
+    5000     ~3.7-5.6 ms          ~2.4-3.1 ms           ~4.3-5.3 ms
+The blits fallback is no faster than separate blits, so the game's layers
+keep to plain (surface, dest) draws with the layer's flags.
+"""
+
+
+class LayerQueue:
+    """Blits queued on one layer, in submission order."""
+    def __init__(self, special_flags=0):
+        """
+        Args:
+            special_flags (int): Blend flags of the layer's plain (surface, dest) draws
+        """
+        self.special_flags = special_flags
+        self.items = []
+        self.uniform = True  # Every item is a (surface, dest) pair using the layer's flags
+
+    def blit(self, source, dest, area=None, special_flags=None):
+        """Queue a draw, like Surface.blit; special_flags defaults to the layer's."""
+        if area is None and special_flags in (None, self.special_flags):
+            self.items.append((source, dest))
+        else:
+            self.uniform = False
+            self.items.append((source, dest, area, self.special_flags if special_flags is None else special_flags))
+
+    def extend(self, pairs):
+        """Queue (surface, dest) pairs drawn with the layer's flags."""
+        self.items.extend(pairs)
+
+    def flush(self, target):
+        """
+        Draw and clear the queued items.
+
+        Returns:
+            int: Number of items drawn
+        """
+        items = self.items
+        if not items:
+            return 0
+        if self.uniform:
+            target.fblits(items, self.special_flags)
+        else:
+            flags = self.special_flags
+            target.blits([item if len(item) == 4 else (*item, None, flags) for item in items], doreturn=False)
+        self.items = []
+        self.uniform = True
+        return len(items)
+
+
+class RenderQueue:
+    """Named layers of queued blits, flushed back to front."""
+    def __init__(self, layers):
+        """
+        Args:
+            layers (dict): Layer name -> blend flags of its plain draws, in draw order
+        """
+        self.layers = {name: LayerQueue(flags) for name, flags in layers.items()}
+        self.draws = 0    # Items drawn by the last flush
+        self.batches = 0  # Blit calls made by the last flush
+
+    def layer(self, name):
+        """Return a layer to queue draws on."""
+        return self.layers[name]
+
+    def flush(self, target):
+        """Draw every layer onto a surface in order and clear the queue."""
+        self.draws = self.batches = 0
+        for layer in self.layers.values():
+            drawn = layer.flush(target)
+            self.draws += drawn
+            self.batches += drawn > 0
+
+    @property
+    def stats(self):
+        """Draws and blit calls of the last flush."""
+        return f"{self.draws} draws in {self.batches} blits"
+
+
+if __name__ == "__main__":
+    # Compare a blit call per draw with queueing and flushing 50, 500 and 5000 draws
+    import os
+    import random
+    import time
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    pygame.init()
+    import display
+
+    screen = display.init()
+    sprite = pygame.Surface((10, 10), pygame.SRCALPHA)
+    sprite.fill((255, 255, 200, 128))
+    rng = random.Random(1)
+    queue = RenderQueue({'glitter': 0})
+    glitter = queue.layer('glitter')
+    for count in (50, 500, 5000):
+        positions = [(rng.randint(0, 1270), rng.randint(0, 710)) for _ in range(count)]
+        repeats = max(20, 20000 // count)
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            for position in positions:
+                screen.blit(sprite, position)
+        blit_ms = (time.perf_counter() - start) / repeats * 1000
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            for position in positions:
+                glitter.blit(sprite, position)
+            queue.flush(screen)
+        fblits_ms = (time.perf_counter() - start) / repeats * 1000
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            for position in positions:
+                glitter.blit(sprite, position, sprite.get_rect())
+            queue.flush(screen)
+        blits_ms = (time.perf_counter() - start) / repeats * 1000
+        print(f"{count:5d} draws: Surface.blit each {blit_ms:7.3f} ms, queued fblits {fblits_ms:7.3f} ms, "
+              f"queued blits {blits_ms:7.3f} ms")
+    pygame.quit()
@@ -1,5 +1,7 @@
 import pygame
 import random
+import animation
+from animation import AnimationClip
 
 class Rock(pygame.sprite.Sprite):
     """Represents rocks moving across the screen."""
@@ -8,26 +10,19 @@ class Rock(pygame.sprite.Sprite):
         'assets/images/rock2.png',
         'assets/images/rock3.png'
     ]
+    FRAMES = ['assets/images/rock1.png', 'assets/images/rock2.png']
 
     def __init__(self, asset_manager, screen_width, screen_height):
         super().__init__()
         
-        # Load fish animation frames
-        self.base_frames = [
-            asset_manager.load_image('assets/images/rock1.png'),
-            asset_manager.load_image('assets/images/rock2.png')
-        ]
-        self.image = self.base_frames[0]
-        # Animation parameters
-        self.current_frame = 0
-        self.animation_timer = 0
-        self.animation_speed = 10  # Lower is faster
-
         # Randomize rock size slightly
         scale = 0.5 #random.uniform(0.7, 1.3)
-        original_size = self.image.get_size()
-        new_size =  (int(original_size[0] * scale), int(original_size[1] * scale))
-        self.image = pygame.transform.scale(self.image, new_size)
+
+        # Animation of the scaled frames, shared by every rock; animation.animate()
+        # shows the frame of the current tick
+        self.clip = AnimationClip.shared([self._scaled_frame(asset_manager, path, scale) for path in self.FRAMES], 10)
+        self.phase = animation.ticks
+        self.image = self.clip.frames[0]
         
         # Position
         self.rect = self.image.get_rect()
@@ -37,17 +32,17 @@ class Rock(pygame.sprite.Sprite):
         # Movement
         self.speed = 5
 
-
+    @staticmethod
+    def _scaled_frame(asset_manager, path, scale):
+        """Return a rock frame scaled by a factor, from the derived surface cache."""
+        frame = asset_manager.load_sprite(path)
+        new_size = (int(frame.get_width() * scale), int(frame.get_height() * scale))
+        return asset_manager.derived_image(
+            'rock_scale', [path], {'size': new_size},
+            lambda: pygame.transform.scale(frame, new_size))
 
     def update(self):
-        """Update rock animation and movement."""
-        # Animate
-        self.animation_timer += 1
-        if self.animation_timer >= self.animation_speed:
-            self.animation_timer = 0
-            self.current_frame = (self.current_frame + 1)  % len(self.base_frames)
-            self.image = self.base_frames[self.current_frame]
-        
+        """Update rock movement."""
         # Move left
         self.rect.x -= self.speed
         
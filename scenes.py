@@ -0,0 +1,434 @@
+"""
+Scenes of the game and the table-driven manager that switches between them.
+
+Each scene declares the images, sounds and music track it needs. Scene
+objects are cheap to create; their surfaces, sounds and game objects are
+built in enter() and dropped in exit(), so only the active scene's assets are
+resident. The SceneManager loads a scene's declared assets when it is
+entered and starts decoding the next scene's music track; on exit it releases
+everything the scene loaded that the next scene does not declare (assets are
+tracked with AssetManager scopes).
+
+Measured with `python scenes.py` (SDL dummy driver, 1280x720, a scripted
+playthrough from the title to the last end slide). Creating every scene up
+front, as the main loop used to, peaks at ~169 MB resident; entering scenes
+one at a time peaks at ~108 MB, of which ~20 MB are the decoded current and
+next music tracks.
+"""
+import pygame
+import display
+import audio
+import tracing
+
+# Each scene imports its modules in enter(), so starting the game only loads
+# what the title needs; numpy and noise come in with the intro's noise overlay
+
+def player_frames(level):
+    """Paths of a player level's swimming frames."""
+    return [f"assets/images/player/player{level}_{i}.png" for i in range(1, 8)]
+
+
+class Scene:
+    """
+    Base scene.
+
+    Attributes:
+        images (list): Image paths loaded on enter
+        sounds (list): Sound paths loaded on enter
+        music (str): Music track played while the scene is active, None to keep the current one
+        draws_on_target (bool): Draws on display.get_target(), i.e. through the
+            renderer with a renderer backend, rather than the internal surface
+    """
+    images = ()
+    sounds = ()
+    music = None
+    draws_on_target = False
+
+    def enter(self, asset_manager):
+        """Build the scene's objects; declared assets are already loaded."""
+
+    def exit(self):
+        """Drop the scene's objects so their surfaces can be freed."""
+
+    def handle_events(self):
+        """Handle pygame events, return False to quit."""
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False
+        return True
+
+    def update(self, dt):
+        """
+        Advance the scene by one frame.
+
+        Args:
+            dt (float): Seconds since the previous frame
+
+        Returns:
+            bool: True when the scene is finished
+        """
+        return False
+
+    def render(self, screen):
+        """Draw the scene onto the internal render surface, or the target if draws_on_target."""
+
+    def tick(self):
+        """Advance any clocks the scene keeps itself."""
+
+    def is_static(self):
+        """Whether nothing on screen changes between frames."""
+        return False
+
+    def is_interactive(self):
+        """Whether the scene is ready for the player's input."""
+        return True
+
+    def held_surfaces(self):
+        """Decoded images the scene holds itself rather than through the AssetManager."""
+        return []
+
+
+class TitleScene(Scene):
+    music = "assets/sounds/mountain.ogg"
+
+    def enter(self, asset_manager):
+        from title import TitleScreen
+        self.title = TitleScreen(asset_manager)
+
+    def exit(self):
+        self.title = None
+
+    def handle_events(self):
+        return self.title.handle_events()
+
+    def update(self, dt):
+        return self.title.update()
+
+    def render(self, screen):
+        screen.fill((0, 0, 0))
+        self.title.render()
+
+    def tick(self):
+        self.title.tick()
+
+    def is_static(self):
+        return self.title.is_static()
+
+    def is_interactive(self):
+        # The start button is shown over a fully visible background
+        return not self.title.is_first_fade
+
+
+class IntroScene(Scene):
+    images = ["assets/images/intro1/intro1_bg.png", "assets/images/river_back.png", *player_frames(1)]
+    music = "assets/sounds/mountain.ogg"
+    draws_on_target = True
+
+    def enter(self, asset_manager):
+        from animate_intro import GameIntro
+        self.intro = GameIntro(asset_manager)
+
+    def exit(self):
+        self.intro.intro_animation.frames.close()
+        self.intro.intro_animation.noise_overlay.close()
+        self.intro.character_animation.noise_overlay.close()
+        self.intro = None
+
+    def handle_events(self):
+        return self.intro.handle_events()
+
+    def update(self, dt):
+        return self.intro.update()
+
+    def render(self, screen):
+        screen.fill((0, 0, 0))
+        self.intro.render()
+
+    def tick(self):
+        self.intro.tick()
+
+    def held_surfaces(self):
+        return self.intro.intro_animation.frames.decoded()
+
+
+class SwimmingScene(Scene):
+    images = [
+        "assets/images/texture.png",
+        *player_frames(1),
+        "assets/images/player/player1_eat.png",
+        "assets/images/fish1.png", "assets/images/fish2.png",
+        "assets/images/miner1.png", "assets/images/miner2.png",
+        "assets/images/rock1.png", "assets/images/rock2.png",
+    ]
+    sounds = [
+        "assets/sounds/coins.ogg", "assets/sounds/miner.ogg",
+        "assets/sounds/CLICK.ogg", "assets/sounds/swim.ogg", "assets/sounds/bird.ogg",
+    ]
+    music = "assets/sounds/pastoral_cut.ogg"
+    draws_on_target = True
+
+    def __init__(self, profiler=None, governor=None):
+        """
+        Args:
+            profiler (FrameProfiler): Profiler whose overlay the game draws
+            governor (QualityGovernor): Governor adjusting the game's effect quality
+        """
+        self.profiler = profiler
+        self.governor = governor
+        self.game = None
+
+    def enter(self, asset_manager):
+        from swimming_game import SwimmingGame
+        self.game = SwimmingGame(asset_manager)
+        self.game.profiler = self.profiler
+        if self.governor:
+            self.governor.apply(self.game)
+
+    def exit(self):
+        self.game.player.stop_sound()
+        self.game.noise_overlay.close()
+        self.game = None
+
+    def handle_events(self):
+        return self.game._handle_events()
+
+    def update(self, dt):
+        if not self.game.game_over and not self.game._update_game_state():
+            self.game.game_over = True
+        # The game draws itself and reports the end of its win fade
+        return self.game._draw() == "end"
+
+    def tick(self):
+        self.game.clock.tick(60)
+
+    def record_frame(self, frame_ms):
+        """
+        Feed a frame's work time to the governor and apply any level change.
+
+        Returns:
+            bool: True if the quality level changed
+        """
+        if self.governor and self.governor.record(frame_ms):
+            self.governor.apply(self.game)
+            return True
+        return False
+
+
+class CurveScene(Scene):
+    """The player swimming along a path over a still background."""
+    music = "assets/sounds/victory.ogg"
+    draws_on_target = True
+
+    BACKGROUNDS = {0: "assets/images/river_back.png", 1: "assets/images/river_forest.png", 2: "assets/images/end_frame_1.png"}
+
+    def __init__(self, waypoints, back, duration=5.0, **animation_args):
+        """
+        Args:
+            waypoints (list): Logical (x, y) points of the path
+            back (int): Background and player level selector of CurveAnimation
+            duration (float): Seconds before moving on to the next scene
+            animation_args: Size and speed arguments of CurveAnimation
+        """
+        self.waypoints = waypoints
+        self.back = back
+        self.duration = duration
+        self.animation_args = animation_args
+        self.images = [self.BACKGROUNDS[back], *player_frames(1 if back == 0 else 4)]
+        self.animation = None
+
+    def enter(self, asset_manager):
+        from animate_intro import CurveAnimation
+        self.animation = CurveAnimation(back=self.back, asset_manager=asset_manager, **self.animation_args)
+        self.animation.set_waypoints(self.waypoints)
+        self.elapsed = 0
+
+    def exit(self):
+        self.animation.noise_overlay.close()
+        self.animation = None
+
+    def update(self, dt):
+        self.animation.update()
+        self.elapsed += dt
+        return self.elapsed >= self.duration
+
+    def render(self, screen):
+        screen.fill((0, 0, 0))
+        self.animation.render()
+
+
+class SlideScene(Scene):
+    """A still image that fades in, holds and fades out."""
+    music = "assets/sounds/victory.ogg"
+    draws_on_target = True
+
+    def __init__(self, path, fade_duration=1.5, stay_duration=3.0, last_slide=False):
+        """
+        Args:
+            path (str): Image path
+            fade_duration (float): Seconds of fade in and fade out
+            stay_duration (float): Seconds fully visible
+            last_slide (bool): Stay visible until the player quits
+        """
+        self.images = [path]
+        self.fade_duration = fade_duration
+        self.stay_duration = stay_duration
+        self.last_slide = last_slide
+        self.frame = None
+
+    def enter(self, asset_manager):
+        from fade_in_frame import FadeInOutFrame
+        image = asset_manager.render_image(asset_manager.load_image(self.images[0]))
+        self.frame = FadeInOutFrame(display.get_target(), image, self.fade_duration,
+                                    self.stay_duration, self.last_slide)
+
+    def exit(self):
+        self.frame = None
+
+    def update(self, dt):
+        # The last slide stays visible until the player quits
+        return not self.frame.update(dt)
+
+    def render(self, screen):
+        screen.fill((0, 0, 0))
+        self.frame.draw()
+
+    def is_static(self):
+        return self.frame.is_static()
+
+
+class SceneManager:
+    """
+    Switches between scenes following a transition table.
+
+    The table maps each scene name to a (scene, next scene name) pair; a
+    finished scene is followed by its next scene, and None ends the table.
+    """
+    def __init__(self, table, asset_manager, start):
+        """
+        Args:
+            table (dict): Scene name -> (Scene, next scene name or None)
+            asset_manager (AssetManager): Shared asset cache
+            start (str): Name of the first scene
+        """
+        self.table = table
+        self.asset_manager = asset_manager
+        self.name = None
+        self.scene = None
+        self.switch(start)
+
+    def switch(self, name):
+        """Exit the current scene, release its assets and enter another one."""
+        scene = self.table[name][0]
+        if self.scene is not None:
+            self.scene.exit()
+            self.asset_manager.close_scope(self.name, keep=[*scene.images, *scene.sounds])
+
+        # Crossfade to the scene's track and start decoding the next scene's
+        if scene.music:
+            audio.get().play_music(scene.music)
+        following = self.table[name][1]
+        if following is not None:
+            audio.get().preload_music(self.table[following][0].music)
+
+        self.asset_manager.open_scope(name)
+        for path in scene.images:
+            self.asset_manager.load_image(path)
+        for path in scene.sounds:
+            self.asset_manager.load_sound(path)
+        scene.enter(self.asset_manager)
+
+        self.name = name
+        self.scene = scene
+        tracing.get().emit('scene', value=tracing.get().intern(name))
+
+    def advance(self):
+        """
+        Move to the scene following the current one.
+
+        Returns:
+            bool: False if the current scene has no successor
+        """
+        following = self.table[self.name][1]
+        if following is None:
+            return False
+        self.switch(following)
+        return True
+
+    def update(self, dt):
+        """
+        Update the current scene and move on when it finishes.
+
+        Returns:
+            bool: True if the scene changed
+        """
+        return self.scene.update(dt) and self.advance()
+
+
+def build_scenes(profiler=None, governor=None):
+    """
+    Scene table of the game, from the title to the last end slide.
+
+    Args:
+        profiler (FrameProfiler): Profiler passed to the swimming scene
+        governor (QualityGovernor): Quality governor passed to the swimming scene
+
+    Returns:
+        dict: Scene name -> (Scene, next scene name)
+    """
+    return {
+        "title": (TitleScene(), "intro"),
+        "intro": (IntroScene(), "swimming"),
+        "swimming": (SwimmingScene(profiler, governor), "end_1"),
+        "end_1": (CurveScene([(508, 390), (600, 475), (415, 529), (590, 672)], back=1,
+                             start_size=20, end_size=400, k=0.005), "end_2"),
+        "end_2": (SlideScene("assets/images/end_frame_2.png"), "end_3"),
+        "end_3": (CurveScene([(448, 341), (576, 434), (328, 581), (1231, 683)], back=2,
+                             start_size=20, end_size=400, k=0.005), "end_4"),
+        "end_4": (SlideScene("assets/images/end_frame_3.png"), "end_5"),
+        "end_5": (SlideScene("assets/images/end_frame_4.png"), "end_6"),
+        "end_6": (SlideScene("assets/images/end_frame_5.png"), "end_7"),
+        "end_7": (SlideScene("assets/images/end_frame_6.png", stay_duration=4.0, last_slide=True), None),
+    }
+
+
+if __name__ == "__main__":
+    # Peak resident memory of a scripted playthrough, with every scene created
+    # up front (eager) or entered one at a time through the SceneManager
+    import os
+    import resource
+    import subprocess
+    import sys
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    if len(sys.argv) < 2:
+        for mode in ("eager", "scoped"):
+            subprocess.run([sys.executable, __file__, mode], check=True)
+        sys.exit()
+
+    from utils import AssetManager
+    pygame.init()
+    screen = display.init()
+    asset_manager = AssetManager()
+    table = build_scenes()
+    frames_per_scene = 120
+
+    if sys.argv[1] == "eager":
+        for name, (scene, _) in table.items():
+            scene.enter(asset_manager)
+        for name, (scene, _) in table.items():
+            for _ in range(frames_per_scene):
+                scene.update(1 / 60)
+                scene.render(screen)
+    else:
+        manager = SceneManager(table, asset_manager, "title")
+        while True:
+            for _ in range(frames_per_scene):
+                manager.scene.update(1 / 60)
+                manager.scene.render(screen)
+            if not manager.advance():
+                break
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{sys.argv[1]:7s} peak RSS {peak_mb:6.1f} MB")
+    pygame.quit()
@@ -0,0 +1,260 @@
+"""
+Content-addressed disk cache of surfaces and arrays derived from assets.
+
+Surfaces computed from source images by a fixed transform (tinted fish,
+scaled title backgrounds, hearts, scaled rocks) and the Perlin noise frames
+are stored under .cache/derived. Entries are keyed by a hash of the
+transform name, its parameters and the contents of every source file, so
+editing a PNG gives its derived surfaces new keys and they are rebuilt on
+the next launch; outdated entries are simply never read again (run
+`python surface_cache.py --clear` to delete them).
+
+Surfaces are stored as their raw display-format pixels after a small header
+and are copied from a memory map straight into a new surface, with no PNG
+decode or conversion. Arrays are .npy files opened memory-mapped.
+
+Measured with `python surface_cache.py` (SDL dummy driver, 1280x720, one
+core), each launch in a fresh process:
+                                    first launch    second launch
+    title and swimming scene setup  ~215-225 ms     ~80-90 ms
+    600 swimming noise frames       ~2.3 s          ~0.7-0.8 s
+The remaining noise time is upscaling each frame to the screen, which
+depends on the overlay size and is not cached.
+"""
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import struct
+import pygame
+import formats
+
+CACHE_DIR = os.path.join(".cache", "derived")
+
+# Bump to invalidate every entry when a transform's output changes
+CACHE_VERSION = 1
+
+# Surface file header: magic, width, height, pitch, bits per pixel, RGBA masks
+HEADER = struct.Struct("<4s8I")
+MAGIC = b"DSRF"
+
+# Digests of source files: path -> ((mtime, size), hex digest)
+_digests = {}
+
+
+def file_digest(path):
+    """Hash of a file's contents, recomputed only when its mtime or size changes; None if missing."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _digests.get(path)
+    if cached is None or cached[0] != stamp:
+        with open(path, "rb") as f:
+            cached = (stamp, hashlib.sha1(f.read()).hexdigest())
+        _digests[path] = cached
+    return cached[1]
+
+
+def key(transform, sources=(), params=None):
+    """
+    Cache key of a derived surface or array.
+
+    Args:
+        transform (str): Name of the function building the entry
+        sources (iterable): Paths of the files it is built from
+        params (dict): JSON-serializable transform parameters
+
+    Returns:
+        str: Hex digest naming the entry
+    """
+    description = {
+        "version": CACHE_VERSION,
+        "transform": transform,
+        "sources": [file_digest(path) for path in sources],
+        "params": params or {},
+    }
+    return hashlib.sha1(json.dumps(description, sort_keys=True).encode()).hexdigest()
+
+
+class SurfaceCache:
+    """Stores derived surfaces and arrays on disk under their content keys."""
+    def __init__(self, directory=CACHE_DIR):
+        """
+        Args:
+            directory (str): Cache directory, created on the first store
+        """
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self.enabled = True
+
+    def _path(self, key, extension):
+        return os.path.join(self.directory, key[:2], key + extension)
+
+    def _write(self, path, write):
+        """Write a file atomically, disabling the cache if the disk refuses."""
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp = f"{path}.{os.getpid()}.tmp"
+            with open(temp, "wb") as f:
+                write(f)
+            os.replace(temp, path)
+        except OSError as e:
+            print(f"Error writing surface cache {path}: {e}")
+            self.enabled = False
+
+    def load_surface(self, key):
+        """
+        Read a surface stored under a key.
+
+        Returns:
+            pygame.Surface: The surface, or None if it is missing or was stored
+                in a different pixel format than the current display's
+        """
+        path = self._path(key, ".surf")
+        try:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                magic, width, height, pitch, bitsize, *masks = HEADER.unpack_from(data)
+                if magic != MAGIC or not formats.is_display_format_masks(bitsize, tuple(masks)):
+                    return None
+                flags = pygame.SRCALPHA if masks[3] else 0
+                surface = pygame.Surface((width, height), flags, bitsize, masks)
+                if surface.get_pitch() != pitch or len(data) != HEADER.size + pitch * height:
+                    return None
+                with memoryview(surface.get_buffer()) as pixels:
+                    pixels[:] = memoryview(data)[HEADER.size:]
+                return surface
+        except (OSError, ValueError, struct.error):
+            return None
+
+    def store_surface(self, key, surface):
+        """Write a surface's raw pixels under a key."""
+        if not self.enabled:
+            return
+        header = HEADER.pack(MAGIC, *surface.get_size(), surface.get_pitch(), surface.get_bitsize(),
+                             *surface.get_masks())
+
+        def write(f):
+            f.write(header)
+            f.write(surface.get_buffer().raw)
+        self._write(self._path(key, ".surf"), write)
+
+    def surface(self, key, build):
+        """
+        Return the surface stored under a key, building and storing it on a miss.
+
+        Args:
+            key (str): Entry key, see key()
+            build (callable): Returns the surface when it is not cached
+
+        Returns:
+            pygame.Surface: Cached or newly built surface
+        """
+        surface = self.load_surface(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = build()
+        self.store_surface(key, surface)
+        return surface
+
+    def load_array(self, key, mmap_mode="r"):
+        """
+        Open an array stored under a key.
+
+        Args:
+            key (str): Entry key
+            mmap_mode (str): numpy memory-map mode, "c" for a writable copy-on-write map
+
+        Returns:
+            numpy.ndarray: Memory-mapped array, or None if it is missing
+        """
+        import numpy as np  # Only noise frames are arrays; keep numpy out of startup
+        try:
+            array = np.load(self._path(key, ".npy"), mmap_mode=mmap_mode)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return array
+
+    def store_array(self, key, array):
+        """Write an array under a key."""
+        import numpy as np
+        if self.enabled:
+            self._write(self._path(key, ".npy"), lambda f: np.save(f, array))
+
+    def clear(self):
+        """Delete every cached entry."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+_cache = None
+
+
+def get():
+    """Return the shared SurfaceCache."""
+    global _cache
+    if _cache is None:
+        _cache = SurfaceCache()
+    return _cache
+
+
+if __name__ == "__main__":
+    # Time the title and swimming scene setup and a loop of noise frames with
+    # an empty cache and again from the cache, each in a fresh process
+    import subprocess
+    import sys
+    import tempfile
+    import time
+
+    if "--clear" in sys.argv:
+        get().clear()
+        sys.exit()
+
+    if len(sys.argv) < 3:
+        directory = tempfile.mkdtemp()
+        for launch in ("first", "second"):
+            subprocess.run([sys.executable, __file__, launch, directory], check=True)
+        shutil.rmtree(directory)
+        sys.exit()
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    import display
+    import surface_cache
+    from utils import AssetManager
+    from noise_overlay import PerlinNoiseOverlay
+    from fish import Fish
+    from title import TitleScreen
+    from swimming_game import SwimmingGame
+
+    display.init()
+    surface_cache.get().directory = sys.argv[2]
+    asset_manager = AssetManager()
+    start = time.perf_counter()
+    TitleScreen(asset_manager)
+    game = SwimmingGame(asset_manager)
+    for tint in Fish.COLOR_TINTS:
+        Fish.tinted_frames_of(asset_manager, tint)
+    scenes_ms = (time.perf_counter() - start) * 1000
+
+    # One loop of the swimming scene's noise overlay
+    overlay = PerlinNoiseOverlay(*display.LOGICAL_SIZE)
+    start = time.perf_counter()
+    for _ in range(600):
+        overlay.generate()
+        overlay.update()
+    noise_ms = (time.perf_counter() - start) * 1000
+    overlay.close()
+
+    cache = surface_cache.get()
+    print(f"{sys.argv[1]:6s} launch: title and swimming setup {scenes_ms:7.1f} ms, "
+          f"600 noise frames {noise_ms:7.1f} ms, cache hits {cache.hits} misses {cache.misses}")
+    game.player.stop_sound()
+    pygame.quit()
@@ -0,0 +1,290 @@
+"""
+Parallel parameter sweep over SwimmingGame difficulty settings.
+
+Runs headless simulations of the swimming game with a scripted or random
+policy for every combination of the given settings and appends one row per
+run to a CSV results table. Rerunning with the same output file skips the
+runs already recorded, so an interrupted sweep resumes where it stopped.
+
+Example:
+    python sweep.py --grid fish_spawn_delay=40,60,80 \\
+                    --grid level_gold_requirements=5:10:15:20,3:6:9:12 \\
+                    --seeds 4 --policy seek --out sweep.csv
+"""
+import argparse
+import collections
+import csv
+import hashlib
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+
+# Settings that can be swept, applied to the game after construction
+SWEEP_PARAMETERS = [
+    'level_gold_requirements',
+    'fish_spawn_delay',
+    'rock_spawn_delay',
+    'miner_spawn_delay',
+    'bird_spawn_delay',
+    'gold_piece_spawn_delay',
+    'hunger_decrease_interval',
+    'hunger_replenish_amount',
+    'max_hunger',
+]
+
+RESULT_FIELDS = ['run_id', 'params', 'seed', 'policy', 'ticks', 'survival_time',
+                 'gold', 'gold_rate', 'score', 'level', 'death_cause']
+
+FPS = 60
+
+# Per-process game resources, created once by _init_worker
+_worker_assets = None
+
+
+def parse_value(text):
+    """Parse a grid value: an int, a float, or a colon-separated per-level list."""
+    if ':' in text:
+        return {level: parse_value(part) for level, part in enumerate(text.split(':'), start=1)}
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def parse_grid(specs):
+    """
+    Parse `name=v1,v2,...` specs into a grid.
+
+    Args:
+        specs (list): Grid specs from the command line
+
+    Returns:
+        dict: Parameter name to list of values
+    """
+    grid = {}
+    for spec in specs:
+        name, _, values = spec.partition('=')
+        if name not in SWEEP_PARAMETERS:
+            raise ValueError(f"Unknown sweep parameter {name!r}; choose from {', '.join(SWEEP_PARAMETERS)}")
+        grid[name] = [parse_value(value) for value in values.split(',')]
+    return grid
+
+
+def expand_jobs(grid, seeds, policy, max_ticks):
+    """Build one job per grid combination and seed."""
+    names = sorted(grid)
+    jobs = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        params = dict(zip(names, values))
+        for seed in range(seeds):
+            key = json.dumps([params, seed, policy, max_ticks], sort_keys=True, default=str)
+            run_id = hashlib.sha1(key.encode()).hexdigest()[:12]
+            jobs.append({'run_id': run_id, 'params': params, 'seed': seed,
+                         'policy': policy, 'max_ticks': max_ticks})
+    return jobs
+
+
+class RandomPolicy:
+    """Holds a random direction for a random number of ticks."""
+    def __init__(self, rng):
+        self.rng = rng
+        self.keys = collections.defaultdict(bool)
+        self.hold = 0
+
+    def __call__(self, game):
+        self.hold -= 1
+        if self.hold <= 0:
+            import pygame
+            self.keys = collections.defaultdict(bool)
+            for key in self.rng.sample([pygame.K_w, pygame.K_s, pygame.K_a, pygame.K_d], self.rng.randint(0, 2)):
+                self.keys[key] = True
+            self.hold = self.rng.randint(10, 60)
+        return self.keys
+
+
+class SeekPolicy:
+    """Steers towards the nearest gold piece or fish and away from nearby miners."""
+    def __init__(self, rng):
+        self.rng = rng
+
+    def __call__(self, game):
+        import pygame
+        player = game.player.rect
+        target = None
+        threat = None
+
+        for miner in game.miner_group:
+            if math.dist(miner.rect.center, player.center) < 200:
+                threat = miner.rect
+                break
+
+        hungry = game.current_hunger <= game.max_hunger // 2
+        candidates = list(game.fish_group) if hungry or not game.gold_pieces_group else list(game.gold_pieces_group)
+        if candidates:
+            target = min(candidates, key=lambda sprite: math.dist(sprite.rect.center, player.center)).rect
+
+        keys = collections.defaultdict(bool)
+        if threat:
+            dx, dy = player.centerx - threat.centerx, player.centery - threat.centery
+        elif target:
+            dx, dy = target.centerx - player.centerx, target.centery - player.centery
+        else:
+            return keys
+
+        # Only press keys along axes with meaningful distance to avoid jitter
+        if dx > 5:
+            keys[pygame.K_d] = True
+        elif dx < -5:
+            keys[pygame.K_a] = True
+        if dy > 5:
+            keys[pygame.K_s] = True
+        elif dy < -5:
+            keys[pygame.K_w] = True
+        return keys
+
+
+POLICIES = {'random': RandomPolicy, 'seek': SeekPolicy}
+
+
+def _init_worker():
+    """Initialise headless pygame once per worker process."""
+    global _worker_assets
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    # Let the pool terminate workers; SDL would otherwise swallow SIGINT/SIGTERM
+    os.environ["SDL_NO_SIGNAL_HANDLERS"] = "1"
+    import pygame
+    import display
+    from utils import AssetManager
+    pygame.init()
+    display.init()
+    _worker_assets = AssetManager()
+
+
+def apply_params(game, params):
+    """Apply swept settings to a freshly created game."""
+    for name, value in params.items():
+        setattr(game, name, value)
+    if 'max_hunger' in params:
+        game.current_hunger = game.max_hunger
+
+
+def run_simulation(job):
+    """
+    Run one headless game until the player dies, wins or the tick limit is hit.
+
+    Args:
+        job (dict): Job description from expand_jobs
+
+    Returns:
+        dict: One results table row
+    """
+    from swimming_game import SwimmingGame
+
+    random.seed(job['seed'])
+    game = SwimmingGame(_worker_assets)
+    apply_params(game, job['params'])
+
+    policy = POLICIES[job['policy']](random.Random(job['seed']))
+    game.player.input_source = lambda: policy(game)
+
+    ticks = 0
+    while ticks < job['max_ticks'] and not game.game_over:
+        if not game._update_game_state():
+            game.game_over = True
+        ticks += 1
+    game.player.stop_sound()
+
+    if game.death_cause:
+        death_cause = game.death_cause
+    elif game.game_over:
+        death_cause = "won"
+    else:
+        death_cause = "timeout"
+
+    survival_time = ticks / FPS
+    return {
+        'run_id': job['run_id'],
+        'params': json.dumps(job['params'], sort_keys=True),
+        'seed': job['seed'],
+        'policy': job['policy'],
+        'ticks': ticks,
+        'survival_time': round(survival_time, 3),
+        'gold': game.collected_gold_pieces,
+        'gold_rate': round(game.collected_gold_pieces / survival_time, 4) if ticks else 0,
+        'score': game.player.score,
+        'level': game.current_level,
+        'death_cause': death_cause,
+    }
+
+
+def load_completed(path):
+    """Return the run ids already recorded in a results file."""
+    if not os.path.exists(path):
+        return set()
+    with open(path, newline='') as results_file:
+        return {row['run_id'] for row in csv.DictReader(results_file)}
+
+
+def summarize(path):
+    """Print mean survival, gold rate and death causes per parameter set."""
+    groups = collections.defaultdict(list)
+    with open(path, newline='') as results_file:
+        for row in csv.DictReader(results_file):
+            groups[row['params']].append(row)
+
+    print(f"{'params':60s} {'runs':>5s} {'survival':>9s} {'gold/s':>7s}  deaths")
+    for params, rows in sorted(groups.items()):
+        survival = sum(float(row['survival_time']) for row in rows) / len(rows)
+        gold_rate = sum(float(row['gold_rate']) for row in rows) / len(rows)
+        deaths = collections.Counter(row['death_cause'] for row in rows)
+        causes = ', '.join(f"{cause}={count}" for cause, count in deaths.most_common())
+        print(f"{params:60s} {len(rows):5d} {survival:9.1f} {gold_rate:7.3f}  {causes}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a headless difficulty sweep of the swimming game.")
+    parser.add_argument('--grid', action='append', default=[], metavar='NAME=V1,V2',
+                        help="Values for one setting; per-level lists use colons, e.g. 5:10:15:20")
+    parser.add_argument('--seeds', type=int, default=3, help="Runs per parameter combination")
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='seek')
+    parser.add_argument('--max-ticks', type=int, default=FPS * 300, help="Tick limit per run")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--out', default='sweep_results.csv')
+    args = parser.parse_args(argv)
+
+    try:
+        grid = parse_grid(args.grid)
+    except ValueError as e:
+        parser.error(str(e))
+
+    jobs = expand_jobs(grid, args.seeds, args.policy, args.max_ticks)
+    completed = load_completed(args.out)
+    pending = [job for job in jobs if job['run_id'] not in completed]
+    print(f"{len(jobs)} runs, {len(jobs) - len(pending)} already done, {len(pending)} to go")
+
+    write_header = not os.path.exists(args.out) or os.path.getsize(args.out) == 0
+    with open(args.out, 'a', newline='') as results_file:
+        writer = csv.DictWriter(results_file, fieldnames=RESULT_FIELDS)
+        if write_header:
+            writer.writeheader()
+
+        # Independent runs with chunksize 1 keep every core busy until the end
+        with multiprocessing.Pool(args.workers, initializer=_init_worker) as pool:
+            for done, row in enumerate(pool.imap_unordered(run_simulation, pending, chunksize=1), start=1):
+                writer.writerow(row)
+                results_file.flush()
+                print(f"[{done}/{len(pending)}] {row['params']} seed={row['seed']}: "
+                      f"{row['death_cause']} after {row['survival_time']}s", file=sys.stderr)
+            pool.close()
+            pool.join()
+
+    summarize(args.out)
+
+
+if __name__ == "__main__":
+    main()
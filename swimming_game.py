@@ -2,39 +2,57 @@ import pygame
 import math
 import sys
 import random
+import display
+import audio
+import tracing
+import animation
 from fish import Fish
-from utils import AssetManager, PerlinNoiseOverlay
+from utils import AssetManager
+from noise_overlay import PerlinNoiseOverlay
 from player import Player
 from rocks import Rock
 from bird import Bird
 from miner import Miner
 from gold import GoldPiece
+from transitions import FadeOverlay
+from text import TextLabel
+from render_group import CullingLayeredGroup, RENDER_LAYERS
+from render_queue import RenderQueue
+from formats import PREMULTIPLIED
 
 class SwimmingGame:
     """Main game class managing game state and loop."""
-    def __init__(self):
-
-        
-        # Screen setup
-        self.screen_width = 1280
-        self.screen_height = 720
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+    def __init__(self, asset_manager=None):
+        """
+        Args:
+            asset_manager (AssetManager): Shared asset cache, or None to create one
+        """
+        # Screen setup: gameplay runs in logical coordinates, drawing at the internal resolution
+        # (on textures with the renderer backend)
+        self.screen_width, self.screen_height = display.LOGICAL_SIZE
+        self.screen = display.get_target()
+        self.view_width, self.view_height = self.screen.get_size()
         
         # Asset management
-        self.asset_manager = AssetManager()
+        self.asset_manager = asset_manager or AssetManager()
+        
+        # Level system parameters
+        self._init_level_system()
         
         # Game objects
         self.clock = pygame.time.Clock()
         self.player = Player(self.asset_manager, self.screen_width // 2, self.screen_height // 2, self.screen_width, self.screen_height)
         
-        # Sprite groups
-        self.all_sprites = pygame.sprite.Group(self.player)
+        # Sprite groups; all_sprites draws in layer order and culls off-screen sprites
+        self.all_sprites = CullingLayeredGroup(asset_manager=self.asset_manager)
+        self.all_sprites.add(self.player, layer=RENDER_LAYERS['player'])
         self.fish_group = pygame.sprite.Group()
         self.rocks_group = pygame.sprite.Group()
         self.miner_group = pygame.sprite.Group()
-        
-        # Level system parameters
-        self._init_level_system()
+
+        # Sprites, hearts and the bar, glitter and HUD text are queued while
+        # drawing and flushed with one batched blit per layer
+        self.render_queue = RenderQueue({'sprites': PREMULTIPLIED, 'hud': 0, 'glitter': 0, 'text': 0})
         
         # Game state parameters
         self._init_game_parameters()
@@ -43,15 +61,38 @@ class SwimmingGame:
         self._load_game_assets()
         
         # Setup background
-        self.noise_overlay = PerlinNoiseOverlay(self.screen_width, self.screen_height)
+        self.noise_overlay = PerlinNoiseOverlay(self.view_width, self.view_height)
         
         # Death screen font
-        self.death_font_large = pygame.font.Font(None, 72)
-        self.death_font_small = pygame.font.Font(None, 48)
+        self.death_font_large = pygame.font.Font(None, display.scale_value(72))
+        self.death_font_small = pygame.font.Font(None, display.scale_value(48))
+
+        # Screen text, rebuilt from glyph atlases only when a string changes
+        white = (255, 255, 255)
+        shadow_offset = max(1, display.scale_value(2))
+        self.level_label = TextLabel(self.font, white, (0, 0, 0), (shadow_offset, shadow_offset))
+        self.score_label = TextLabel(self.font, white, (0, 0, 0), (shadow_offset, shadow_offset))
+        self.progress_label = TextLabel(self.font, white)
+        self.game_over_label = TextLabel(self.death_font_large, (255, 0, 0))
+        self.win_label = TextLabel(self.death_font_large, (255, 215, 0))  # Gold color
+        self.final_score_label = TextLabel(self.death_font_small, white)
+        self.restart_label = TextLabel(self.death_font_small, white)
+        self.quit_label = TextLabel(self.death_font_small, white)
+
+        # Optional ScreenObserver capturing each rendered frame
+        self.observer = None
+
+        # Optional FrameProfiler whose overlay is drawn on top of each frame
+        self.profiler = None
+
+        # Effect quality, adjusted by the QualityGovernor
+        self.glitter_cap = 60
+        self.hud_shadows = True
 
     def _init_level_system(self):
         """Initialize level progression system."""
         self.current_level = 1
+        tracing.get().level = self.current_level
         self.max_levels = 4
     
         # Level gold piece requirements
@@ -81,9 +122,10 @@ class SwimmingGame:
 
         # Check if level is complete
         if self.level_timer >= self.level_duration:
-            print('asdfasd')
             if self.current_level < self.max_levels:
+                tracing.get().emit('level_up', value=self.current_level + 1)
                 self.current_level += 1
+                tracing.get().level = self.current_level
                 self.level_timer = 0
                 self.level_progress = 0
             else:
@@ -106,6 +148,7 @@ class SwimmingGame:
                 
             # Drawing
             self._draw()
+            display.flip()
             
             # Cap frame rate
             self.clock.tick(60)
@@ -124,6 +167,7 @@ class SwimmingGame:
         
         # Restore level and gold pieces
         self.current_level = preserved_level
+        tracing.get().level = self.current_level
         self.collected_gold_pieces = preserved_gold
         
         # Reset player
@@ -138,7 +182,7 @@ class SwimmingGame:
         self.gold_pieces_group.empty()
         
         # Add player back to sprite groups
-        self.all_sprites.add(self.player)
+        self.all_sprites.add(self.player, layer=RENDER_LAYERS['player'])
         
         # Reset game over state
         self.game_over = False
@@ -149,6 +193,9 @@ class SwimmingGame:
         if self.game_over:
             return False
 
+        # Advance the shared animation tick
+        animation.advance()
+
         # Spawn game elements
         self._spawn_elements()
         
@@ -158,6 +205,9 @@ class SwimmingGame:
         self.rocks_group.update()
         self.miner_group.update()
         self.bird_group.update(self.fish_group)
+
+        # Show the current frame of every animated sprite's clip
+        animation.animate(self.fish_group, self.rocks_group, self.miner_group, (self.player,))
         self._handle_miner_collisions()
 
         # Manage hit cooldown
@@ -169,6 +219,8 @@ class SwimmingGame:
         
         # Check if player is trapped
         if self._check_player_trapped_by_rocks():
+            tracing.get().emit_sprite('rock_trap', self.player, RENDER_LAYERS['player'])
+            self.death_cause = "rocks"
             return False
         
         # Update gold piece group
@@ -182,6 +234,7 @@ class SwimmingGame:
         
         # Check hunger
         if self.current_hunger <= 0:
+            self.death_cause = self.last_damage
             return False
         
         self._update_hunger()
@@ -197,6 +250,7 @@ class SwimmingGame:
                 self.player.set_level(self.asset_manager, self.current_level +1)
 
                 self.current_level += 1
+                tracing.get().level = self.current_level
         else:
             # Check if we've collected enough gold pieces to win the game
             if self.collected_gold_pieces >= self.level_gold_requirements[self.current_level]:
@@ -215,27 +269,25 @@ class SwimmingGame:
 
     def _draw_win_screen(self):
         """Display the win screen."""
-        win_text = self.death_font_large.render("Congratulations! You Win!", True, (255, 215, 0))  # Gold color
-        score_text = self.death_font_small.render(f"Final Score: {self.player.score}", True, (255, 255, 255))
-        restart_text = self.death_font_small.render("Press R to Restart or Q to Quit", True, (255, 255, 255))
-
-        self.screen.blit(win_text, (self.screen_width // 2 - win_text.get_width() // 2, self.screen_height // 3))
-        self.screen.blit(score_text, (self.screen_width // 2 - score_text.get_width() // 2, self.screen_height // 2))
-        self.screen.blit(restart_text, (self.screen_width // 2 - restart_text.get_width() // 2, self.screen_height // 2 + 50))
+        center_x = self.view_width // 2
+        self.win_label.draw(self.screen, "Congratulations! You Win!", midtop=(center_x, self.view_height // 3))
+        self.final_score_label.draw(self.screen, f"Final Score: {self.player.score}", midtop=(center_x, self.view_height // 2))
+        self.restart_label.draw(self.screen, "Press R to Restart or Q to Quit",
+                                midtop=(center_x, self.view_height // 2 + display.scale_value(50)))
         
     def _draw(self):
         """Draw game elements."""
         # Background
         self.screen.fill((135, 206, 235))  # Sky blue 
-        noise_surface = self.noise_overlay.generate()
-        self.screen.blit(noise_surface, (0, 0))
+        self.noise_overlay.draw(self.screen)
 
         if not self.game_over:
             # Draw sprites
-            self.all_sprites.draw(self.screen)
+            self._draw_sprites()
             
             # Draw UI elements
             self._draw_ui()
+            self._flush_render_queue()
         else:
             # If the player won (reached max level and collected required gold)
             if self.current_level == self.max_levels and self.collected_gold_pieces >= self.level_gold_requirements[self.current_level]:
@@ -244,12 +296,12 @@ class SwimmingGame:
                     self.fading = True
                 
                 # Draw sprites and UI for a smooth transition
-                self.all_sprites.draw(self.screen)
+                self._draw_sprites()
                 self._draw_ui()
+                self._flush_render_queue()
                 
                 # Draw the fade overlay
-                self.fade_surface.set_alpha(self.fade_alpha)
-                self.screen.blit(self.fade_surface, (0, 0))
+                self.fade_overlay.draw(self.screen, self.fade_alpha)
                 
                 # Check if fade is complete
                 if self._update_fade():
@@ -258,13 +310,31 @@ class SwimmingGame:
             else:
                 self._draw_death_screen()
         
-        # Update display
+        # Capture the finished frame for observers
+        if self.observer:
+            self.observer.capture()
+
+        if self.profiler:
+            self.profiler.draw(self.screen)
+
+        # Advance the overlay animation; the caller presents the frame
         self.noise_overlay.update()
-        pygame.display.flip()
         
         # Default return if we didn't transition to a new state
         return None
 
+    def _draw_sprites(self):
+        """Queue on-screen sprites by layer, mapping logical rects to the internal resolution."""
+        self.all_sprites.queue(self.render_queue.layer('sprites'))
+        if self.profiler:
+            self.profiler.fields["sprites"] = self.all_sprites.stats
+
+    def _flush_render_queue(self):
+        """Draw the queued sprites and UI onto the screen."""
+        self.render_queue.flush(self.screen)
+        if self.profiler:
+            self.profiler.fields["blits"] = self.render_queue.stats
+
 
 
     def _update_fade(self):
@@ -275,7 +345,7 @@ class SwimmingGame:
             
             # Start fading music when screen begins to darken
             if not self.music_fade_started and self.fade_alpha > 20:
-                pygame.mixer.music.fadeout(2000)  # 3000ms = 3 seconds to fade out
+                audio.get().fadeout_music(2000)  # 2000ms = 2 seconds to fade out
                 self.music_fade_started = True
             
             # Return True when fade is complete
@@ -288,8 +358,7 @@ class SwimmingGame:
         # Add fade parameters
         self.fading = False
         self.fade_alpha = 0  # Start completely transparent
-        self.fade_surface = pygame.Surface((self.screen_width, self.screen_height))
-        self.fade_surface.fill((0, 0, 0))  # Black surface for fading
+        self.fade_overlay = FadeOverlay((self.view_width, self.view_height))  # Shared black overlay
         self.fade_speed = 3  # How quickly to fade (alpha increase per frame)
         self.music_fade_started = False
 
@@ -299,6 +368,10 @@ class SwimmingGame:
         self.gold_piece_spawn_delay = 300  # Adjust spawning frequency
         self.collected_gold_pieces = 0
         self.gold_pieces_needed_for_level = 10  # Collect 10 gold pieces to progress
+
+        # Textured progress bar and the fill width it was built for
+        self.progress_bar = None
+        self.progress_bar_width = None
         
         # Replace level_timer with gold piece progression
         self.current_gold_pieces = 0
@@ -336,6 +409,8 @@ class SwimmingGame:
         
         # Game state
         self.game_over = False
+        self.death_cause = None  # "hunger", "miner" or "rocks" once the player dies
+        self.last_damage = "hunger"
 
 
 
@@ -361,16 +436,13 @@ class SwimmingGame:
 
     def _load_game_assets(self):
         """Load game images and fonts."""
-        self.texture = pygame.image.load("assets/images/texture.png").convert_alpha()
+        self.texture = self.asset_manager.render_image(self.asset_manager.load_image("assets/images/texture.png"))
         # Heart images
         try:
-            full_heart_sheet = pygame.image.load("assets/images/player6.png").convert_alpha()
-            half_heart_sheet = pygame.image.load("assets/images/player_half.png").convert_alpha()
-            
-            # Heart image scaling
-            heart_size = (50, 50)
-            self.full_heart_image = self._process_heart_image(full_heart_sheet, heart_size)
-            self.half_heart_image = self._process_heart_image(half_heart_sheet, heart_size)
+            # Heart image scaling, cached with the sheets' contents
+            heart_size = (display.scale_value(50), display.scale_value(50))
+            self.full_heart_image = self._load_heart_image("assets/images/player6.png", heart_size)
+            self.half_heart_image = self._load_heart_image("assets/images/player_half.png", heart_size)
             
             # Ghosted heart for empty states
             self.ghosted_heart = self.full_heart_image.copy()
@@ -382,12 +454,18 @@ class SwimmingGame:
             self.ghosted_heart = None
         
         # Fonts and sound
-        self.font = pygame.font.Font(None, 36)
+        self.font = pygame.font.Font(None, display.scale_value(36))
         self.coin_sound = self.asset_manager.load_sound("assets/sounds/coins.ogg", 0.5)
         self.miner_sound = self.asset_manager.load_sound("assets/sounds/miner.ogg", 0.2)
 
         # self._setup_background_music()
 
+    def _load_heart_image(self, path: str, size: tuple) -> pygame.Surface:
+        """Return the heart of a sprite sheet at a size, from the derived surface cache."""
+        return self.asset_manager.derived_image(
+            "heart", [path], {"size": size},
+            lambda: self._process_heart_image(self.asset_manager.load_image(path), size))
+
     def _process_heart_image(self, sheet: pygame.Surface, size: tuple) -> pygame.Surface:
         """Process heart image from sprite sheet."""
         heart_image = sheet.subsurface((0, 0, sheet.get_height(), sheet.get_height()))
@@ -395,12 +473,7 @@ class SwimmingGame:
 
     def _setup_background_music(self):
         """Set up and play background music."""
-        try:
-            pygame.mixer.music.load("assets/sounds/pastoral_cut.ogg")
-            pygame.mixer.music.set_volume(0.3)
-            pygame.mixer.music.play(-1)
-        except pygame.error as e:
-            print(f"Error loading background music: {e}")
+        audio.get().play_music("assets/sounds/pastoral_cut.ogg")
 
 
 
@@ -413,6 +486,10 @@ class SwimmingGame:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return False
+
+            # Toggle profiler overlay
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3 and self.profiler:
+                self.profiler.toggle()
             
             # Restart game on death screen
             if self.game_over and event.type == pygame.KEYDOWN:
@@ -431,7 +508,7 @@ class SwimmingGame:
         if self.gold_piece_spawn_timer >= self.gold_piece_spawn_delay:
             new_gold_piece = GoldPiece(self.asset_manager, self.screen_width, self.screen_height)
             self.gold_pieces_group.add(new_gold_piece)
-            self.all_sprites.add(new_gold_piece)
+            self.all_sprites.add(new_gold_piece, layer=RENDER_LAYERS['gold'])
             self.gold_piece_spawn_timer = 0
 
     def _spawn_birds(self):
@@ -440,7 +517,7 @@ class SwimmingGame:
         if self.bird_spawn_timer >= self.bird_spawn_delay:
             new_bird = Bird(self.asset_manager, self.screen_width, self.screen_height)
             self.bird_group.add(new_bird)
-            self.all_sprites.add(new_bird)
+            self.all_sprites.add(new_bird, layer=RENDER_LAYERS['birds'])
             self.bird_spawn_timer = 0
 
     def _spawn_miners(self):
@@ -451,7 +528,7 @@ class SwimmingGame:
             # print("Spawning miner!")  # Debug print
             new_miner = Miner(self.asset_manager, self.screen_width, self.screen_height)
             self.miner_group.add(new_miner)
-            self.all_sprites.add(new_miner)
+            self.all_sprites.add(new_miner, layer=RENDER_LAYERS['miners'])
             self.miner_spawn_timer = 0
 
 
@@ -459,51 +536,29 @@ class SwimmingGame:
     def _draw_death_screen(self):
         """Draw game over screen."""
         # Darken the screen
-        overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 128))  # Semi-transparent black
-        self.screen.blit(overlay, (0, 0))
-        
-        # Game Over text
-        game_over_text = self.death_font_large.render("game over...", True, (255, 0, 0))
-        score_text = self.death_font_small.render(f"Score: {self.player.score}", True, (255, 255, 255))
-        restart_text = self.death_font_small.render("press R for restart", True, (255, 255, 255))
-        quit_text = self.death_font_small.render("press q for quit", True, (255, 255, 255))
-        
-        # Center text
-        game_over_rect = game_over_text.get_rect(center=(self.screen_width//2, self.screen_height//2 - 100))
-        score_rect = score_text.get_rect(center=(self.screen_width//2, self.screen_height//2))
-        restart_rect = restart_text.get_rect(center=(self.screen_width//2, self.screen_height//2 + 100))
-        quit_rect = quit_text.get_rect(center=(self.screen_width//2, self.screen_height//2 + 150))
-        
-        # Blit text
-        self.screen.blit(game_over_text, game_over_rect)
-        self.screen.blit(score_text, score_rect)
-        self.screen.blit(restart_text, restart_rect)
-        self.screen.blit(quit_text, quit_rect)
+        self.fade_overlay.draw(self.screen, 128)  # Semi-transparent black
+        
+        # Centered game over text
+        center_x = self.view_width // 2
+        center_y = self.view_height // 2
+        self.game_over_label.draw(self.screen, "game over...", center=(center_x, center_y - display.scale_value(100)))
+        self.final_score_label.draw(self.screen, f"Score: {self.player.score}", center=(center_x, center_y))
+        self.restart_label.draw(self.screen, "press R for restart", center=(center_x, center_y + display.scale_value(100)))
+        self.quit_label.draw(self.screen, "press q for quit", center=(center_x, center_y + display.scale_value(150)))
 
     def _draw_ui(self):
         """Draw user interface elements with updated positioning."""
         # UI Configuration
-        ui_margin = 20
-        text_color = (255, 255, 255)  # White text for better contrast
-        shadow_color = (0, 0, 0)  # Black shadow for depth
-        
-        # Level in top left
-        level_text = self.font.render(f"Level: {self.current_level}", True, text_color)
-        level_shadow = self.font.render(f"Level: {self.current_level}", True, shadow_color)
-        self.screen.blit(level_shadow, (ui_margin + 2, ui_margin + 2))
-        self.screen.blit(level_text, (ui_margin, ui_margin))
+        ui_margin = display.scale_value(20)
+        text = self.render_queue.layer('text')
         
-        # Coins and level center top
-        center_top_x = self.screen_width // 2
-        center_top_y = ui_margin
+        # Level in top left, white with a black shadow
+        self.level_label.draw(text, f"Level: {self.current_level}", self.hud_shadows,
+                              topleft=(ui_margin, ui_margin))
         
-        score_text = self.font.render(f"Score: {self.player.score}", True, text_color)
-        score_shadow = self.font.render(f"Score: {self.player.score}", True, shadow_color)
-        score_rect = score_text.get_rect(center=(center_top_x, center_top_y))
-        
-        self.screen.blit(score_shadow, (score_rect.x + 2, score_rect.y + 2))
-        self.screen.blit(score_text, score_rect)
+        # Score center top
+        self.score_label.draw(text, f"Score: {self.player.score}", self.hud_shadows,
+                              center=(self.view_width // 2, ui_margin))
         
         # Hunger bar center bottom
         self._draw_heart_hunger_bar_centered()
@@ -517,54 +572,45 @@ class SwimmingGame:
             return
         
         # Calculate total width of hunger bar
-        total_width = (self.full_heart_image.get_width() + 5) * (self.max_hunger // 2)
+        spacing = display.scale_value(5)
+        total_width = (self.full_heart_image.get_width() + spacing) * (self.max_hunger // 2)
         
         # Starting position to center the hunger bar
-        start_x = (self.screen_width - total_width) // 2
-        start_y = self.screen_height - self.full_heart_image.get_height() - 80  # 20 pixels from bottom
+        start_x = (self.view_width - total_width) // 2
+        start_y = self.view_height - self.full_heart_image.get_height() - display.scale_value(80)  # 20 pixels from bottom
+        hud = self.render_queue.layer('hud')
         
         for i in range(self.max_hunger // 2):
-            jiggle_offset = self._calculate_heart_jiggle(i)
+            jiggle_offset = self._calculate_heart_jiggle(i) * display.scale
             
             # Calculate heart positions
-            heart_x = start_x + i * (self.full_heart_image.get_width() + 5)
+            heart_x = start_x + i * (self.full_heart_image.get_width() + spacing)
             heart_y = start_y + jiggle_offset
             
             # Draw hearts based on current hunger
             if i < self.current_hunger / 2:
                 if i < self.current_hunger // 2:
                     # Full hearts
-                    self.screen.blit(self.full_heart_image, (heart_x, heart_y))
+                    hud.blit(self.full_heart_image, (heart_x, heart_y))
                 elif self.current_hunger % 2 == 1:
                     # Half heart
-                    self.screen.blit(self.ghosted_heart, (heart_x, heart_y))
-                    self.screen.blit(self.half_heart_image, (heart_x, heart_y))
+                    hud.blit(self.ghosted_heart, (heart_x, heart_y))
+                    hud.blit(self.half_heart_image, (heart_x, heart_y))
             else:
                 # Ghosted/empty hearts
-                self.screen.blit(self.ghosted_heart, (heart_x, heart_y))
+                hud.blit(self.ghosted_heart, (heart_x, heart_y))
 
-    def _draw_level_progress_centered(self):
-        """Draw level progress bar centered near the bottom of the screen with texture over entire bar and glitter effects."""        
-        bar_width = 400
-        bar_height = 20
-        bar_x = (self.screen_width - bar_width) // 2
-        bar_y = self.screen_height - 70  # Positioned above the hunger bar
-        
-        # Calculate current level's gold requirement
-        current_level_requirement = self.level_gold_requirements[self.current_level]
-        
-        # Calculate gold piece collection progress
-        progress_width = int((self.collected_gold_pieces / current_level_requirement) * bar_width)
-        
+    def _build_progress_bar(self, bar_width, bar_height, border_radius, progress_width):
+        """Textured progress bar with rounded corners, filled up to progress_width."""
         # Create a surface for the entire bar (background and progress)
         bar_surface = pygame.Surface((bar_width, bar_height), pygame.SRCALPHA)
         
         # Draw the background (gray) part
-        pygame.draw.rect(bar_surface, (100, 100, 100), pygame.Rect(0, 0, bar_width, bar_height), border_radius=10)
+        pygame.draw.rect(bar_surface, (100, 100, 100), pygame.Rect(0, 0, bar_width, bar_height), border_radius=border_radius)
         
         # Draw the progress (gold) part
         if progress_width > 0:
-            pygame.draw.rect(bar_surface, (255, 215, 0), pygame.Rect(0, 0, progress_width, bar_height), border_radius=10)
+            pygame.draw.rect(bar_surface, (255, 215, 0), pygame.Rect(0, 0, progress_width, bar_height), border_radius=border_radius)
         
         # Apply texture to the entire bar
         texture_width, texture_height = self.texture.get_size()
@@ -577,16 +623,36 @@ class SwimmingGame:
         
         # Create a mask for the rounded corners
         mask_surface = pygame.Surface((bar_width, bar_height), pygame.SRCALPHA)
-        pygame.draw.rect(mask_surface, (255, 255, 255, 255), pygame.Rect(0, 0, bar_width, bar_height), border_radius=10)
+        pygame.draw.rect(mask_surface, (255, 255, 255, 255), pygame.Rect(0, 0, bar_width, bar_height), border_radius=border_radius)
         
         # Apply the mask to the texture (to respect rounded corners)
         texture_surface.blit(mask_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MIN)
         
         # Apply the textured mask to the bar
         bar_surface.blit(texture_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+        return bar_surface
+
+    def _draw_level_progress_centered(self):
+        """Draw level progress bar centered near the bottom of the screen with texture over entire bar and glitter effects."""        
+        bar_width = display.scale_value(400)
+        bar_height = display.scale_value(20)
+        border_radius = display.scale_value(10)
+        bar_x = (self.view_width - bar_width) // 2
+        bar_y = self.view_height - display.scale_value(70)  # Positioned above the hunger bar
+        
+        # Calculate current level's gold requirement
+        current_level_requirement = self.level_gold_requirements[self.current_level]
+        
+        # Calculate gold piece collection progress
+        progress_width = int((self.collected_gold_pieces / current_level_requirement) * bar_width)
         
-        # Draw the final bar to the screen
-        self.screen.blit(bar_surface, (bar_x, bar_y))
+        # The bar only changes with the progress, so it is rebuilt only then
+        if progress_width != self.progress_bar_width:
+            self.progress_bar = self._build_progress_bar(bar_width, bar_height, border_radius, progress_width)
+            self.progress_bar_width = progress_width
+
+        # Queue the final bar
+        self.render_queue.layer('hud').blit(self.progress_bar, (bar_x, bar_y))
         
         # Add glitter effect - only to the filled portion of the progress bar
         if not hasattr(self, 'glitter_particles'):
@@ -600,10 +666,10 @@ class SwimmingGame:
             self.last_glitter_spawn = current_time
             # Add 1-2 new particles (less particles)
             for _ in range(random.randint(1, 2)):
-                if progress_width > 0:  # Only add particles if there's progress
+                if progress_width > 0 and len(self.glitter_particles) < self.glitter_cap:  # Only add particles if there's progress
                     particle_x = random.randint(bar_x, bar_x + progress_width)
                     particle_y = random.randint(bar_y, bar_y + bar_height)
-                    particle_size = random.uniform(1.5, 2.5)
+                    particle_size = max(1, random.uniform(1.5, 2.5) * display.scale)
                     particle_color = random.choice([
                         (255, 255, 255),  # White
                         (255, 255, 200),  # Light yellow
@@ -615,39 +681,35 @@ class SwimmingGame:
                     angle = random.uniform(0, 2 * math.pi)
                     speed = random.uniform(0.1, 0.3)  # Much slower movement
                     
+                    # Draw the glitter as a circle once; it fades with surface alpha
+                    particle_surface = pygame.Surface((particle_size * 2, particle_size * 2), pygame.SRCALPHA)
+                    pygame.draw.circle(particle_surface, particle_color, (particle_size, particle_size), particle_size)
+
                     self.glitter_particles.append({
                         'x': particle_x,
                         'y': particle_y,
                         'size': particle_size,
                         'color': particle_color,
+                        'surface': particle_surface,
                         'life': particle_life,
                         'max_life': particle_life,
                         'vel_x': math.cos(angle) * speed,
                         'vel_y': math.sin(angle) * speed
                     })
         
-        # Update and draw existing particles
+        # Update and queue existing particles
+        glitter = self.render_queue.layer('glitter')
         for i, particle in enumerate(self.glitter_particles[:]):
             # Reduce particle life
             particle['life'] -= 1
             
             # Make particle fade out over time
             alpha = int(255 * (particle['life'] / particle['max_life']))
+            particle['surface'].set_alpha(alpha)
             
-            # Create a surface with per-pixel alpha for the glitter particle
-            particle_surface = pygame.Surface((particle['size'] * 2, particle['size'] * 2), pygame.SRCALPHA)
-            
-            # Draw the glitter as a soft circle with transparency
-            pygame.draw.circle(
-                particle_surface,
-                (*particle['color'], alpha),
-                (particle['size'], particle['size']),
-                particle['size']
-            )
-            
-            # Blit the particle to the screen
-            self.screen.blit(
-                particle_surface, 
+            # Queue the particle
+            glitter.blit(
+                particle['surface'], 
                 (int(particle['x'] - particle['size']), int(particle['y'] - particle['size']))
             )
             
@@ -676,13 +738,11 @@ class SwimmingGame:
                 self.glitter_particles.remove(particle)
         
         # Progress text centered
-        progress_text = self.font.render(
-            f"Level {self.current_level}: {self.collected_gold_pieces}/{current_level_requirement}", 
-            True, 
-            (255, 255, 255)
+        self.progress_label.draw(
+            self.render_queue.layer('text'),
+            f"Level {self.current_level}: {self.collected_gold_pieces}/{current_level_requirement}",
+            center=(self.view_width // 2, bar_y + bar_height + display.scale_value(25))
         )
-        progress_text_rect = progress_text.get_rect(center=(self.screen_width // 2, bar_y + bar_height + 25))
-        self.screen.blit(progress_text, progress_text_rect)
         
     def _handle_gold_piece_collection(self):
         """Handle player collecting gold pieces."""
@@ -690,7 +750,8 @@ class SwimmingGame:
         if collected_pieces:
             # Play a collection sound (add to asset manager)
             # self.gold_collect_sound.play()
-            self.coin_sound.play()
+            audio.get().play(self.coin_sound, 'pickups')
+            tracing.get().emit_sprite('gold_collected', self.player, RENDER_LAYERS['gold'], len(collected_pieces))
             # Increment collected gold pieces
             self.collected_gold_pieces += len(collected_pieces)
             
@@ -703,7 +764,7 @@ class SwimmingGame:
         if self.rock_spawn_timer >= self.rock_spawn_delay:
             new_rock = Rock(self.asset_manager, self.screen_width, self.screen_height)
             self.rocks_group.add(new_rock)
-            self.all_sprites.add(new_rock)
+            self.all_sprites.add(new_rock, layer=RENDER_LAYERS['rocks'])
             self.rock_spawn_timer = 0
 
     def _spawn_fish(self):
@@ -712,7 +773,7 @@ class SwimmingGame:
         if self.fish_spawn_timer >= self.fish_spawn_delay:
             new_fish = Fish(self.asset_manager, self.screen_width, self.screen_height)
             self.fish_group.add(new_fish)
-            self.all_sprites.add(new_fish)
+            self.all_sprites.add(new_fish, layer=RENDER_LAYERS['fish'])
             self.fish_spawn_timer = 0
 
     def _handle_miner_collisions(self):
@@ -723,13 +784,15 @@ class SwimmingGame:
                 if miner.check_collision(self.player):
                     # Lose one heart
                     self.current_hunger = max(0, self.current_hunger - 2)
+                    self.last_damage = "miner"
+                    tracing.get().emit_sprite('miner_hit', miner, RENDER_LAYERS['miners'], self.current_hunger)
                     
                     # Set hit cooldown to prevent rapid multiple hits
                     self.miner_hit_cooldown = 30  # Adjust as needed for balance
                     
                     # Optional: Add hit sound
                     # You might want to add a hit sound to your asset manager
-                    self.miner_sound.play()
+                    audio.get().play(self.miner_sound, 'hazards')
                     break
 
     def _check_player_trapped_by_rocks(self):
@@ -753,7 +816,8 @@ class SwimmingGame:
         """Handle player eating fish."""
         fish_eaten = pygame.sprite.spritecollide(self.player, self.fish_group, True)
         if fish_eaten:
-            self.player.eat_sound.play()
+            audio.get().play(self.player.eat_sound, 'pickups', priority=0)
+            tracing.get().emit_sprite('fish_eaten', self.player, RENDER_LAYERS['fish'], len(fish_eaten))
             self.player.score += len(fish_eaten)
             self.player.is_eating = True
             self.player.eating_timer = self.player.eating_duration
@@ -787,6 +851,8 @@ class SwimmingGame:
         if self.hunger_decrease_timer >= self.hunger_decrease_interval:
             if self.current_hunger > 0:
                 self.current_hunger -= 1
+                self.last_damage = "hunger"
+                tracing.get().emit('hunger_tick', value=self.current_hunger)
             self.hunger_decrease_timer = 0
         
         # Increment jiggle time for heart animation
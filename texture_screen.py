@@ -0,0 +1,243 @@
+"""
+Drawing target for the SDL Renderer backend (display.init(backend='renderer')).
+
+TextureScreen stands in for the internal render surface in the swimming game
+and the cutscenes: it has the Surface methods they draw with (fill, blit,
+blits, fblits and the size getters), but each source surface is uploaded to a
+pygame._sdl2.video Texture the first time it is drawn and copied by the
+renderer from then on. Textures are cached by surface identity, so sprite
+frames, tinted fish, rotated birds, hearts and text labels are uploaded once;
+per-frame surfaces (a new noise frame, the progress bar) are uploaded when
+first drawn and their textures dropped with them. A surface redrawn in place
+must be passed to forget() before it is drawn again. Surface alpha
+(set_alpha) is applied per copy as texture alpha.
+
+Premultiplied sprites (BLEND_PREMULTIPLIED) are copied with a custom
+premultiplied blend mode where the renderer supports one; SDL's software
+renderer does not, so their straight-alpha colours are restored once, on
+upload.
+
+The noise overlay is uploaded at its noise resolution and stretched by the
+renderer (blit_scaled), so no full-size noise surface is built per frame.
+
+Measured with `python texture_screen.py` (SDL dummy driver, SDL's software
+renderer, 1280x720, one core), frame time including presenting:
+    scene                         surface      software renderer
+    swimming (1500 frames)        ~3.0-3.5 ms  ~6.7-7.4 ms
+    curve cutscene (600 frames)   ~2.3-2.6 ms  ~7.4-7.7 ms
+Texture uploads are not the cost (~2 per frame after the first frames); SDL's
+software rasterizer blends and stretches more slowly than pygame's blitters.
+The backend is there for machines with an accelerated renderer, where copies
+are done by the GPU; this machine cannot measure one.
+"""
+import weakref
+import pygame
+from pygame._sdl2 import video
+from formats import PREMULTIPLIED
+
+# SDL_ComposeCustomBlendMode(ONE, ONE_MINUS_SRC_ALPHA, ADD) for colour and alpha
+PREMULTIPLIED_BLEND_MODE = 0x06210621
+
+
+class TextureScreen:
+    """Draws surfaces through an SDL renderer with the drawing methods of a Surface."""
+    def __init__(self, renderer, size):
+        """
+        Args:
+            renderer (pygame._sdl2.video.Renderer): Renderer of the game window
+            size (tuple): Internal render resolution, the renderer's logical size
+        """
+        self.renderer = renderer
+        self.size = tuple(size)
+        renderer.logical_size = self.size
+        self.textures = weakref.WeakKeyDictionary()  # Surface -> Texture
+        self.uploads = 0
+        self.drawn = False  # Something was drawn since the last present
+        self.stream = None  # Streaming texture presenting a software-drawn frame
+
+        # Probe once for premultiplied blending
+        probe = video.Texture(renderer, (1, 1))
+        try:
+            probe.blend_mode = PREMULTIPLIED_BLEND_MODE
+            self.premultiplied_blending = True
+        except video.error:
+            self.premultiplied_blending = False
+
+    def get_size(self):
+        return self.size
+
+    def get_width(self):
+        return self.size[0]
+
+    def get_height(self):
+        return self.size[1]
+
+    def get_rect(self, **kwargs):
+        rect = pygame.Rect((0, 0), self.size)
+        for name, value in kwargs.items():
+            setattr(rect, name, value)
+        return rect
+
+    def texture(self, surface, premultiplied=False):
+        """
+        Return the texture of a surface, uploading it on first use.
+
+        Args:
+            surface (pygame.Surface): Source surface
+            premultiplied (bool): Whether its colours are premultiplied by alpha
+        """
+        texture = self.textures.get(surface)
+        if texture is None:
+            if premultiplied and not self.premultiplied_blending and surface.get_masks()[3]:
+                texture = video.Texture.from_surface(self.renderer, unpremultiply(surface))
+            else:
+                texture = video.Texture.from_surface(self.renderer, surface)
+                if premultiplied and self.premultiplied_blending:
+                    texture.blend_mode = PREMULTIPLIED_BLEND_MODE
+            self.textures[surface] = texture
+            self.uploads += 1
+        return texture
+
+    def forget(self, surface):
+        """Drop the texture of a surface whose pixels changed."""
+        self.textures.pop(surface, None)
+
+    def fill(self, color, rect=None):
+        """Fill the whole target or a rect with an opaque colour."""
+        self.renderer.draw_color = color
+        if rect is None:
+            self.renderer.clear()
+        else:
+            self.renderer.fill_rect(rect)
+        self.drawn = True
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        """
+        Copy a surface's texture, like Surface.blit.
+
+        Returns:
+            pygame.Rect: Area drawn, unclipped
+        """
+        texture = self.texture(source, special_flags == PREMULTIPLIED)
+        alpha = source.get_alpha()
+        texture.alpha = 255 if alpha is None else alpha
+        if area is not None:
+            area = pygame.Rect(area)
+            rect = pygame.Rect(dest[0], dest[1], area.width, area.height)
+        else:
+            rect = pygame.Rect((dest[0], dest[1]), source.get_size())
+        texture.draw(srcrect=area, dstrect=rect)
+        self.drawn = True
+        return rect
+
+    def blit_scaled(self, source, rect, special_flags=0):
+        """Copy a surface's texture stretched over a rect."""
+        texture = self.texture(source, special_flags == PREMULTIPLIED)
+        alpha = source.get_alpha()
+        texture.alpha = 255 if alpha is None else alpha
+        texture.draw(dstrect=rect)
+        self.drawn = True
+
+    def blits(self, blit_sequence, doreturn=True):
+        """Copy a sequence of (source, dest[, area[, special_flags]]) items, like Surface.blits."""
+        rects = [self.blit(*item) for item in blit_sequence]
+        return rects if doreturn else None
+
+    def fblits(self, blit_sequence, special_flags=0):
+        """Copy a sequence of (source, dest) pairs with the same blend flags, like Surface.fblits."""
+        premultiplied = special_flags == PREMULTIPLIED
+        textures = self.textures
+        for source, dest in blit_sequence:
+            texture = textures.get(source) or self.texture(source, premultiplied)
+            alpha = source.get_alpha()
+            texture.alpha = 255 if alpha is None else alpha
+            texture.draw(dstrect=(dest[0], dest[1]))
+        self.drawn = True
+
+    def present(self, surface):
+        """
+        Show the frame: what was drawn on this target, or else a surface drawn in software.
+
+        Args:
+            surface (pygame.Surface): Internal render surface of scenes that do not
+                draw through the renderer, uploaded through a streaming texture
+        """
+        if not self.drawn:
+            if self.stream is None:
+                self.stream = video.Texture(self.renderer, surface.get_size(), streaming=True)
+            self.stream.update(surface)
+            self.stream.draw()
+        self.renderer.present()
+        self.drawn = False
+
+
+def unpremultiply(surface):
+    """Copy of a premultiplied surface with straight-alpha colours."""
+    import numpy as np  # Only needed by renderers without premultiplied blending
+    straight = surface.copy()
+    rgb = pygame.surfarray.pixels3d(straight)
+    alpha = pygame.surfarray.pixels_alpha(straight)
+    scale = np.where(alpha > 0, 255.0 / np.maximum(alpha, 1), 0.0)[..., None]
+    rgb[...] = np.minimum(rgb * scale + 0.5, 255).astype(np.uint8)
+    del rgb, alpha
+    return straight
+
+
+if __name__ == "__main__":
+    # Frame time of a scripted swimming run and the curve cutscene with each
+    # backend, presenting every frame, each backend in a fresh process
+    import os
+    import random
+    import subprocess
+    import sys
+    import time
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    if len(sys.argv) < 2:
+        for backend in ('surface', 'software'):
+            subprocess.run([sys.executable, __file__, backend], check=True)
+        sys.exit()
+
+    pygame.init()
+    import display
+    from swimming_game import SwimmingGame
+    from animate_intro import CurveAnimation
+    from utils import AssetManager
+    from sweep import RandomPolicy
+
+    backend = sys.argv[1]
+    display.init(backend=backend)
+    asset_manager = AssetManager()
+    random.seed(1)
+    game = SwimmingGame(asset_manager)
+    policy = RandomPolicy(random.Random(1))
+    game.player.input_source = lambda: policy(game)
+    frames = 1500
+    start = time.perf_counter()
+    for _ in range(frames):
+        if not game._update_game_state():
+            game._restart_game()
+        game._draw()
+        display.flip()
+    swimming_ms = (time.perf_counter() - start) / frames * 1000
+    game.player.stop_sound()
+
+    # Noise frames are computed once beforehand so both backends read them from the ring
+    curve = CurveAnimation(back=0, asset_manager=asset_manager)
+    frames = 600
+    for _ in range(frames):
+        curve.noise_overlay.generate(upscale=False)
+        curve.noise_overlay.update()
+    curve.noise_overlay.time = 0
+    start = time.perf_counter()
+    for _ in range(frames):
+        curve.update()
+        curve.render()
+        display.flip()
+    curve_ms = (time.perf_counter() - start) / frames * 1000
+    curve.noise_overlay.close()
+    target = display.get_target()
+    uploads = f", {target.uploads} texture uploads" if target is not display.get_surface() else ""
+    print(f"{backend:8s} swimming {swimming_ms:6.2f} ms per frame, curve cutscene {curve_ms:6.2f} ms per frame{uploads}")
+    pygame.quit()
@@ -0,0 +1,174 @@
+import pygame
+import time
+
+class FrameThrottle:
+    """
+    Lowers the main loop's frame rate when nothing on screen needs to change.
+
+    Modes:
+        active      - full frame rate, every frame rendered
+        static      - the scene reports nothing is animating; the loop sleeps on
+                      pygame.event.wait and only redraws after input
+        background  - the window lost focus; frames render at a low rate
+        minimized   - the window is hidden; the loop sleeps and never redraws
+
+    Any input event or a scene animation resuming returns to the active mode
+    on the next frame. CPU time is accumulated per mode, so the saving can be
+    read from cpu_usage() or the profiler overlay.
+    """
+    WINDOW_EVENTS = (
+        pygame.WINDOWFOCUSLOST, pygame.WINDOWFOCUSGAINED,
+        pygame.WINDOWMINIMIZED, pygame.WINDOWRESTORED,
+        pygame.WINDOWHIDDEN, pygame.WINDOWSHOWN,
+        pygame.WINDOWEXPOSED,
+    )
+
+    def __init__(self, fps=60, static_fps=10, background_fps=10, minimized_fps=4):
+        """
+        Args:
+            fps (int): Frame rate while active
+            static_fps (int): Wake-up rate while the scene is static
+            background_fps (int): Frame rate while the window is unfocused
+            minimized_fps (int): Wake-up rate while the window is hidden
+        """
+        self.fps = fps
+        self.static_fps = static_fps
+        self.background_fps = background_fps
+        self.minimized_fps = minimized_fps
+
+        self.focused = True
+        self.visible = True
+        self.exposed = True  # Window contents must be redrawn
+        self.mode = "active"
+
+        # CPU and wall time spent in each mode
+        self.cpu_time = {}
+        self.wall_time = {}
+        self._last_cpu = time.process_time()
+        self._last_wall = time.perf_counter()
+
+    def _poll_window_events(self):
+        """Consume window state events; scenes do not use them."""
+        for event in pygame.event.get(self.WINDOW_EVENTS):
+            if event.type == pygame.WINDOWFOCUSLOST:
+                self.focused = False
+            elif event.type == pygame.WINDOWFOCUSGAINED:
+                self.focused = True
+            elif event.type in (pygame.WINDOWMINIMIZED, pygame.WINDOWHIDDEN):
+                self.visible = False
+            elif event.type in (pygame.WINDOWRESTORED, pygame.WINDOWSHOWN):
+                self.visible = True
+                self.exposed = True
+            elif event.type == pygame.WINDOWEXPOSED:
+                self.exposed = True
+
+    def _wait(self, fps):
+        """Sleep until an event arrives or the next wake-up is due."""
+        event = pygame.event.wait(1000 // fps)
+        if event.type != pygame.NOEVENT:
+            # Put it back for the scene's own event handling
+            pygame.event.post(event)
+
+    def _account(self):
+        """Charge the time since the last frame to the current mode."""
+        cpu = time.process_time()
+        wall = time.perf_counter()
+        self.cpu_time[self.mode] = self.cpu_time.get(self.mode, 0.0) + cpu - self._last_cpu
+        self.wall_time[self.mode] = self.wall_time.get(self.mode, 0.0) + wall - self._last_wall
+        self._last_cpu = cpu
+        self._last_wall = wall
+
+    def tick(self, clock, scene_static=False):
+        """
+        Wait for the next frame, replacing clock.tick(fps) in the main loop.
+
+        Args:
+            clock (pygame.time.Clock): Main loop clock
+            scene_static (bool): Whether the current scene is not animating
+
+        Returns:
+            int: Milliseconds since the previous frame
+        """
+        self._account()
+        self._poll_window_events()
+
+        if not self.visible:
+            self.mode = "minimized"
+            self._wait(self.minimized_fps)
+        elif scene_static and not pygame.event.peek():
+            self.mode = "static"
+            self._wait(self.static_fps)
+        elif not self.focused:
+            self.mode = "background"
+            return clock.tick(self.background_fps)
+        else:
+            self.mode = "active"
+            return clock.tick(self.fps)
+
+        self._poll_window_events()
+        return clock.tick()
+
+    def should_render(self, scene_static, had_input=False):
+        """
+        Whether this frame needs to be drawn and presented.
+
+        Args:
+            scene_static (bool): Whether the current scene is not animating
+            had_input (bool): Whether events arrived this frame
+        """
+        if not self.visible:
+            return False
+        if scene_static and not had_input and not self.exposed:
+            return False
+        self.exposed = False
+        return True
+
+    def force_redraw(self):
+        """Redraw on the next frame, e.g. after a scene change."""
+        self.exposed = True
+
+    def cpu_usage(self, mode=None):
+        """
+        Fraction of one core used in a mode, or in the current mode by default.
+        """
+        mode = mode or self.mode
+        wall = self.wall_time.get(mode, 0.0)
+        return self.cpu_time.get(mode, 0.0) / wall if wall else 0.0
+
+    def report(self):
+        """One line per mode with wall time and CPU usage."""
+        return "\n".join(
+            f"{mode:10s} {self.wall_time[mode]:8.1f} s  cpu {self.cpu_usage(mode) * 100:5.1f}%"
+            for mode in sorted(self.wall_time)
+        )
+
+
+if __name__ == "__main__":
+    # Measure CPU use of the last end slide with and without throttling
+    import os
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    import display
+    from fade_in_frame import FadeInOutFrame
+
+    screen = display.init()
+    image = pygame.image.load("assets/images/end_frame_6.png").convert_alpha()
+
+    for throttled in (False, True):
+        slide = FadeInOutFrame(screen, image, fade_duration=0.5, stay_duration=4.0, last_slide=True)
+        throttle = FrameThrottle(static_fps=10 if throttled else 60)
+        clock = pygame.time.Clock()
+        end = time.perf_counter() + 4
+        while time.perf_counter() < end:
+            static = throttled and slide.is_static()
+            dt = throttle.tick(clock, static) / 1000.0
+            pygame.event.get()
+            slide.update(dt)
+            if throttle.should_render(static):
+                screen.fill((0, 0, 0))
+                slide.draw()
+                display.flip()
+        print("throttled" if throttled else "unthrottled")
+        print(throttle.report())
+    pygame.quit()
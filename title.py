@@ -1,6 +1,10 @@
 import pygame
 import os
 import sys
+import display
+import transitions
+from text import TextLabel
+from utils import AssetManager
 
 class Button:
     def __init__(self, x, y, width, height, text, font, idle_color, hover_color, text_color):
@@ -10,6 +14,7 @@ class Button:
         self.idle_color = idle_color
         self.hover_color = hover_color
         self.text_color = text_color
+        self.label = TextLabel(font, text_color)
         self.is_hovered = False
         self.is_clicked = False
     
@@ -17,11 +22,9 @@ class Button:
         """Draw the button on the given surface."""
         current_color = self.hover_color if self.is_hovered else self.idle_color
         pygame.draw.rect(surface, current_color, self.rect, border_radius=1)
-        pygame.draw.rect(surface, self.text_color, self.rect, 2, border_radius=1)
+        pygame.draw.rect(surface, self.text_color, self.rect, max(1, display.scale_value(2)), border_radius=1)
         
-        text_surface = self.font.render(self.text, True, self.text_color)
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        surface.blit(text_surface, text_rect)
+        self.label.draw(surface, self.text, center=self.rect.center)
     
     def update(self, mouse_pos, mouse_clicked):
         """Update button state based on mouse position and click."""
@@ -36,13 +39,13 @@ class Button:
         return False
 
 class TitleScreen:
-    def __init__(self):
+    def __init__(self, asset_manager=None):
         pygame.init()
+        self.asset_manager = asset_manager or AssetManager()
         
-        # Screen setup
-        self.screen_width = 1280
-        self.screen_height = 720
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+        # Screen setup: the title is laid out directly at the internal resolution
+        self.screen = display.get_surface()
+        self.screen_width, self.screen_height = self.screen.get_size()
         
         # Colors
         self.WHITE = (220, 220, 220)
@@ -53,15 +56,20 @@ class TitleScreen:
         self.DARK_BLUE = (93, 70, 49)
         
         # Fonts
-        self.title_font = pygame.font.Font(None, 120)
-        self.subtitle_font = pygame.font.Font(None, 60)
-        self.button_font = pygame.font.Font(None, 45)
+        self.title_font = pygame.font.Font(None, display.scale_value(120))
+        self.subtitle_font = pygame.font.Font(None, display.scale_value(60))
+        self.button_font = pygame.font.Font(None, display.scale_value(45))
+
+        # Title text with a subtle shadow for better readability
+        shadow_offset = max(1, display.scale_value(3))
+        self.title_label = TextLabel(self.title_font, self.WHITE, self.BLACK, (shadow_offset, shadow_offset))
+        self.subtitle_label = TextLabel(self.subtitle_font, self.WHITE, self.BLACK, (shadow_offset, shadow_offset))
         
         # Start Button
-        button_width = 250
-        button_height = 70
+        button_width = display.scale_value(250)
+        button_height = display.scale_value(70)
         button_x = (self.screen_width - button_width) // 2
-        button_y = self.screen_height // 2 + 250
+        button_y = self.screen_height // 2 + display.scale_value(250)
         self.start_button = Button(
             button_x, button_y, 
             button_width, button_height, 
@@ -78,7 +86,6 @@ class TitleScreen:
         self.next_bg_index = 1
         
         # Crossfade variables
-        self.fade_surface = pygame.Surface((self.screen_width, self.screen_height))
         self.fade_alpha = 0
         self.fade_speed = 3
         self.hold_timer = 0
@@ -99,10 +106,13 @@ class TitleScreen:
         images_path = 'assets/images/titles'
         try:
             image_files = [f for f in os.listdir(images_path) if f.endswith(('.png', '.jpg', '.jpeg'))]
-            images = [pygame.transform.scale(
-                pygame.image.load(os.path.join(images_path, img)).convert(), 
-                (self.screen_width, self.screen_height)
-            ) for img in image_files]
+            size = (self.screen_width, self.screen_height)
+            paths = [os.path.join(images_path, img) for img in image_files]
+            # Scaled to the screen once per image content, see AssetManager.derived_image
+            images = [self.asset_manager.derived_image(
+                'title_background', [path], {'size': size},
+                lambda path=path: pygame.transform.scale(pygame.image.load(path).convert(), size)
+            ) for path in paths]
             return images
         except FileNotFoundError:
             print(f"Could not find images in {images_path}")
@@ -110,26 +120,11 @@ class TitleScreen:
     
     def _draw_text(self):
         """Draw title and subtitles."""
-        # Main title
-        title_text = self.title_font.render("Golden Hound", True, self.WHITE)
-        title_rect = title_text.get_rect(center=(self.screen_width//2, self.screen_height//2 - 250))
-        
-        # Second subtitle
-        subtitle_text = self.subtitle_font.render("art, code, music by speedlimit35", True, self.WHITE)
-        subtitle_rect = subtitle_text.get_rect(center=(self.screen_width//2, self.screen_height//2 + 200))
-        
-        # Draw text with a subtle shadow for better readability
-        shadow_offset = 3
-        
-        # Title shadow
-        shadow_title = self.title_font.render("Golden Hound", True, self.BLACK)
-        self.screen.blit(shadow_title, (title_rect.x + shadow_offset, title_rect.y + shadow_offset))
-        self.screen.blit(title_text, title_rect)
-        
-        # Subtitle shadow
-        shadow_subtitle = self.subtitle_font.render("art, code, music by speedlimit35", True, self.BLACK)
-        self.screen.blit(shadow_subtitle, (subtitle_rect.x + shadow_offset, subtitle_rect.y + shadow_offset))
-        self.screen.blit(subtitle_text, subtitle_rect)
+        # Main title and subtitle, each cached with its shadow
+        self.title_label.draw(self.screen, "Golden Hound",
+                              center=(self.screen_width//2, self.screen_height//2 - display.scale_value(250)))
+        self.subtitle_label.draw(self.screen, "art, code, music by speedlimit35",
+                                 center=(self.screen_width//2, self.screen_height//2 + display.scale_value(200)))
         
         # Draw start button
         self.start_button.draw(self.screen)
@@ -137,10 +132,8 @@ class TitleScreen:
     def _handle_first_fade_in(self):
         """Handle initial fade-in of the first background image."""
         if self.is_first_fade:
-            # Create a surface with the first background image
-            first_bg = self.background_images[self.current_bg_index].copy()
-            first_bg.set_alpha(self.first_fade_alpha)
-            self.screen.blit(first_bg, (0, 0))
+            # Fade in the first background image
+            transitions.blit_faded(self.screen, self.background_images[self.current_bg_index], self.first_fade_alpha)
             
             # Increase fade alpha
             self.first_fade_alpha += 5
@@ -156,17 +149,15 @@ class TitleScreen:
         if self.is_first_fade:
             return
         
-        # Draw current background
-        self.screen.blit(self.background_images[self.current_bg_index], (0, 0))
-        
         # Check if it's time to cycle
-        self.hold_timer += self.clock.get_time()
-        
         if self.hold_timer >= self.HOLD_TIME:
-            # Start fading
-            self.fade_surface.blit(self.background_images[self.next_bg_index], (0, 0))
-            self.fade_surface.set_alpha(self.fade_alpha)
-            self.screen.blit(self.fade_surface, (0, 0))
+            # Crossfade to the next background
+            transitions.crossfade(
+                self.screen,
+                self.background_images[self.current_bg_index],
+                self.background_images[self.next_bg_index],
+                self.fade_alpha / 255
+            )
             
             # Increase fade
             self.fade_alpha += self.fade_speed
@@ -177,14 +168,21 @@ class TitleScreen:
                 self.next_bg_index = (self.next_bg_index + 1) % len(self.background_images)
                 self.hold_timer = 0
                 self.fade_alpha = 0
+        else:
+            # Hold the current background
+            self.screen.blit(self.background_images[self.current_bg_index], (0, 0))
     
     def update(self):
         """Update title screen state for one frame. Returns True when completed."""
         if self.completed:
             return True
+
+        # Advance the hold timer between crossfades
+        if not self.is_first_fade:
+            self.hold_timer += self.clock.get_time()
             
         # Update button with mouse state
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = display.mouse_pos()
         mouse_clicked = pygame.mouse.get_pressed()[0]  # Left mouse button
         
         # Check if button is clicked
@@ -207,9 +205,6 @@ class TitleScreen:
         
         # Draw text and button
         self._draw_text()
-        
-        # Update display
-        pygame.display.flip()
     
     def handle_events(self):
         """Handle pygame events, return False to quit."""
@@ -221,7 +216,7 @@ class TitleScreen:
                 
             # Additional event handling for button hover
             if event.type == pygame.MOUSEMOTION:
-                self.start_button.is_hovered = self.start_button.rect.collidepoint(event.pos)
+                self.start_button.is_hovered = self.start_button.rect.collidepoint(display.mouse_pos(event.pos))
                 
         return True
     
@@ -229,6 +224,10 @@ class TitleScreen:
         """Control frame rate."""
         self.clock.tick(60)
     
+    def is_static(self):
+        """Check if the background is holding between crossfades."""
+        return not self.is_first_fade and self.hold_timer < self.HOLD_TIME
+
     def is_completed(self):
         """Check if title screen is completed (button clicked)."""
         return self.completed
@@ -0,0 +1,93 @@
+"""
+Fade and crossfade helpers shared by the title, cutscenes and swimming game.
+
+Images are converted once to opaque display-format surfaces and faded with
+surface alpha, and darkening uses one cached black overlay per size, so
+fade-in, hold, fade-out and crossfade draw without allocating per frame.
+With the compositor given several threads, FadeOverlay darkens in bands
+through it instead of blitting its overlay.
+"""
+import pygame
+
+# Cached black overlays keyed by size
+_overlays = {}
+
+
+def to_opaque(image, background=(0, 0, 0)):
+    """
+    Flatten an image onto a solid background in the display format.
+
+    Fading the result with surface alpha over the same background colour looks
+    identical to fading the original per-pixel alpha image, at opaque blit cost.
+
+    Args:
+        image (pygame.Surface): Image, possibly with per-pixel alpha
+        background (tuple): Colour the image is shown over
+
+    Returns:
+        pygame.Surface: Opaque surface in the display format
+    """
+    opaque = pygame.Surface(image.get_size()).convert()
+    opaque.fill(background)
+    opaque.blit(image, (0, 0))
+    return opaque
+
+
+def blit_faded(target, image, alpha, dest=(0, 0)):
+    """
+    Blit an opaque image at the given alpha without copying it.
+
+    Args:
+        target (pygame.Surface): Surface to draw on
+        image (pygame.Surface): Opaque image to fade
+        alpha (int): 0 (invisible) to 255 (fully visible)
+        dest (tuple): Top-left position on the target
+    """
+    alpha = max(0, min(255, int(alpha)))
+    if alpha == 0:
+        return
+    if alpha < 255:
+        image.set_alpha(alpha)
+        target.blit(image, dest)
+        image.set_alpha(255)
+    else:
+        target.blit(image, dest)
+
+
+def crossfade(target, current, following, progress, dest=(0, 0)):
+    """
+    Draw `current` blending into `following`.
+
+    Args:
+        progress (float): 0 shows only current, 1 only following
+    """
+    target.blit(current, dest)
+    blit_faded(target, following, 255 * progress, dest)
+
+
+class FadeOverlay:
+    """Darkens a surface with a shared, cached black overlay."""
+    def __init__(self, size, color=(0, 0, 0)):
+        self.color = tuple(color)
+        key = (tuple(size), self.color)
+        if key not in _overlays:
+            overlay = pygame.Surface(size).convert()
+            overlay.fill(color)
+            _overlays[key] = overlay
+        self.surface = _overlays[key]
+
+    def draw(self, target, alpha):
+        """
+        Blend the overlay over the target.
+
+        Args:
+            target (pygame.Surface): Surface to darken
+            alpha (int): 0 (no effect) to 255 (fully black)
+        """
+        # numpy is only imported once a scene darkens the screen, not with the title
+        import compositor
+        alpha = max(0, min(255, int(alpha)))
+        if 0 < alpha < 255 and target.get_size() == self.surface.get_size() and \
+                compositor.get().blend_color(target, self.color, alpha):
+            return
+        blit_faded(target, self.surface, alpha)
@@ -1,17 +1,37 @@
 import pygame
-import noise
-import numpy as np
+import weakref
+import display
+import formats
+import surface_cache
 
 class AssetManager:
     """Manages loading and caching of game assets."""
-    def __init__(self):
+    def __init__(self, render_scale=None):
+        """
+        Args:
+            render_scale (float): Internal render resolution relative to the logical
+                1280x720 layout, defaults to the current display scale
+        """
         self.images = {}
+        self.sprites = {}  # Premultiplied copies of images drawn as sprites
+        self.derived = {}  # Surfaces built from images: cache key -> surface
         self.sounds = {}
 
+        # Resource scopes: scope name -> paths loaded while it was open
+        self.scope = None
+        self.scopes = {}
+
+        # Internal-resolution copies of logical surfaces, dropped with their source
+        self.render_scale = display.scale if render_scale is None else render_scale
+        self.render_images = weakref.WeakKeyDictionary()
+
     def load_image(self, path, convert=True):
         """
         Load and cache an image.
         
+        Converted images are in the display format: opaque if no pixel is
+        transparent, otherwise with straight per-pixel alpha.
+        
         Args:
             path (str): Path to the image file
             convert (bool): Whether to convert image for faster rendering
@@ -19,16 +39,79 @@ class AssetManager:
         Returns:
             pygame.Surface: Loaded and cached image
         """
+        self._track(path)
         if path not in self.images:
             try:
                 image = pygame.image.load(path)
-                self.images[path] = image.convert_alpha() if convert else image
+                self.images[path] = formats.normalize(image) if convert else image
             except pygame.error as e:
                 print(f"Error loading image {path}: {e}")
                 # Fallback to a default image or surface
                 self.images[path] = pygame.Surface((50, 50), pygame.SRCALPHA)
+            # Scale for the internal render resolution once, at load time
+            self.render_image(self.images[path])
         return self.images[path]
 
+    def load_sprite(self, path):
+        """
+        Load and cache an image with premultiplied alpha.
+        
+        Sprites must be blitted with special_flags=pygame.BLEND_PREMULTIPLIED.
+        
+        Args:
+            path (str): Path to the image file
+        
+        Returns:
+            pygame.Surface: Premultiplied display-format image
+        """
+        image = self.load_image(path)
+        if path not in self.sprites:
+            sprite = image.premul_alpha() if image.get_flags() & pygame.SRCALPHA else image
+            self.sprites[path] = sprite
+            self.render_image(sprite)
+        return self.sprites[path]
+
+    def derived_image(self, transform, sources, params, build):
+        """
+        Return a surface derived from source images, built once per source content.
+        
+        The surface is kept in memory and in the disk cache under a key of the
+        transform, its parameters and the source files' contents, so later
+        launches read it back instead of building it.
+        
+        Args:
+            transform (str): Name of the transform, part of the cache key
+            sources (list): Paths of the images the surface is built from
+            params (dict): JSON-serializable transform parameters
+            build (callable): Builds the surface on a cache miss
+        
+        Returns:
+            pygame.Surface: Derived surface, at the size build() makes it
+        """
+        key = surface_cache.key(transform, sources, params)
+        self._track(key)
+        if key not in self.derived:
+            self.derived[key] = surface_cache.get().surface(key, build)
+        return self.derived[key]
+
+    def render_image(self, surface):
+        """
+        Return the version of a logical-size surface to draw at the internal resolution.
+        
+        Args:
+            surface (pygame.Surface): Image sized for the logical 1280x720 layout
+        
+        Returns:
+            pygame.Surface: The surface itself at full resolution, otherwise a cached scaled copy
+        """
+        if self.render_scale == 1:
+            return surface
+        scaled = self.render_images.get(surface)
+        if scaled is None:
+            scaled = display.scale_surface(surface, self.render_scale)
+            self.render_images[surface] = scaled
+        return scaled
+
     def load_sound(self, path, volume=1.0):
         """
         Load and cache a sound.
@@ -40,6 +123,7 @@ class AssetManager:
         Returns:
             pygame.mixer.Sound: Loaded and cached sound
         """
+        self._track(path)
         if path not in self.sounds:
             try:
                 sound = pygame.mixer.Sound(path)
@@ -51,33 +135,41 @@ class AssetManager:
                 self.sounds[path] = pygame.mixer.Sound(None)
         return self.sounds[path]
 
+    def _track(self, path):
+        """Record a path as used by the open scope."""
+        if self.scope is not None:
+            self.scopes[self.scope].add(path)
 
-class PerlinNoiseOverlay:
-    def __init__(self, width, height, noise_width=25, noise_height=100, scale=0.05, alpha=60):
-        self.width = width
-        self.height = height
-        self.noise_width = noise_width
-        self.noise_height = noise_height
-        self.scale = scale
-        self.alpha = alpha
-        self.time = 0
-    
-    def generate(self):
-        """Generates a Perlin noise texture."""
-        x_vals, y_vals = np.meshgrid(
-            np.linspace(0, self.noise_width * self.scale, self.noise_width),
-            np.linspace(0, self.noise_height * self.scale, self.noise_height)
-        )
-
-        noise_array = np.vectorize(lambda x, y: noise.pnoise3(x, y, self.time * 0.1, octaves=3))(x_vals, y_vals)
-        noise_array = ((noise_array + 1) * 127.5).astype(np.uint8)  # Normalize to 0-255
+    def open_scope(self, name):
+        """
+        Start recording the images and sounds loaded under a scope name.
+        
+        Args:
+            name (str): Scope name, e.g. the scene being entered
+        """
+        self.scope = name
+        self.scopes.setdefault(name, set())
 
-        surface = pygame.Surface((self.noise_width, self.noise_height))
-        noise_rgb = np.stack([noise_array.T] * 3, axis=-1)  # Convert grayscale to RGB
-        pygame.surfarray.blit_array(surface, noise_rgb)
-        
-        surface.set_alpha(self.alpha)  # Adjust transparency
-        return pygame.transform.scale(surface, (self.width, self.height)).convert_alpha()  # Upscale
-    
-    def update(self):
-        self.time += 1  # Increment time for animation
+    def close_scope(self, name, keep=()):
+        """
+        Release images, derived surfaces and sounds loaded under a scope.
+        
+        Assets still used by another open scope or listed in `keep` stay cached.
+        
+        Args:
+            name (str): Scope to close
+            keep (iterable): Paths to keep cached, e.g. those the next scene declares
+        
+        Returns:
+            int: Number of assets released
+        """
+        paths = self.scopes.pop(name, set())
+        if self.scope == name:
+            self.scope = None
+        in_use = set(keep).union(*self.scopes.values())
+        released = 0
+        for path in paths - in_use:
+            self.sprites.pop(path, None)
+            if any(cache.pop(path, None) is not None for cache in (self.images, self.derived, self.sounds)):
+                released += 1
+        return released